@@ -0,0 +1,179 @@
+
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def normalize_messages(messages: List[Dict]) -> List[Dict]:
+    """Drop whitespace that does not change a prompt's meaning
+    
+    Trailing spaces, blank lines and CRLF line endings are removed; leading
+    indentation is kept, since it is significant in pasted code.
+    """
+    normalized = []
+    for message in messages:
+        lines = message.get("content", "").replace("\r\n", "\n").split("\n")
+        content = "\n".join(line.rstrip() for line in lines if line.strip())
+        normalized.append({"role": message.get("role"), "content": content})
+    return normalized
+
+
+def make_cache_key(model: str, temperature: float, max_tokens: int, messages: List[Dict]) -> str:
+    """Hash of everything that determines a completion"""
+    key_data = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": normalize_messages(messages)
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of AIML API responses
+    
+    The first tier is an in-process LRU of up to max_entries responses; the second
+    is a SQLite table that survives restarts and is shared by every process using
+    the same file. Both expire entries ttl seconds after they were stored. A disk
+    hit is copied into the LRU. Pass db_path=None for a memory-only cache.
+    
+    Expired entries are kept for one more ttl so get(allow_stale=True) can still
+    serve them while the API is unavailable.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, db_path: Optional[str] = "data/aiml_cache.db", max_entries: int = 512, ttl: float = 86400):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # cache_key -> (expires_at, response), least recently used first
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "stores": 0,
+                          "evictions": 0}
+        
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            conn.executescript(self.SCHEMA)
+            with conn:
+                conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - ttl,))
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+    
+    def get(self, cache_key: str, allow_stale: bool = False, count_miss: bool = True) -> Optional[Dict]:
+        """Cached response for a key, or None; allow_stale also returns expired entries
+        
+        Pass count_miss=False for a repeated lookup whose miss was already counted.
+        """
+        now = 0 if allow_stale else time.time()
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(cache_key)
+                self._counters["stale_hits" if allow_stale else "memory_hits"] += 1
+                return entry[1]
+        
+        if self.db_path:
+            try:
+                row = self._connect().execute(
+                    "SELECT response, expires_at FROM responses WHERE cache_key = ? AND expires_at > ?",
+                    (cache_key, now)
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                response = json.loads(row[0])
+                self._remember(cache_key, response, row[1])
+                self._count("stale_hits" if allow_stale else "disk_hits")
+                return response
+        
+        if count_miss and not allow_stale:
+            self._count("misses")
+        return None
+    
+    def put(self, cache_key: str, response: Dict):
+        """Store a response in both tiers"""
+        expires_at = time.time() + self.ttl
+        self._remember(cache_key, response, expires_at)
+        if self.db_path:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (cache_key, response, expires_at) VALUES (?, ?, ?)",
+                        (cache_key, json.dumps(response), expires_at)
+                    )
+            except sqlite3.Error:
+                # The memory tier still has it; a read-only or locked file only costs persistence
+                pass
+        self._count("stores")
+    
+    def _remember(self, cache_key: str, response: Dict, expires_at: float):
+        with self._lock:
+            self._memory[cache_key] = (expires_at, response)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+    
+    def delete(self, cache_key: str):
+        """Drop one response from both tiers"""
+        with self._lock:
+            self._memory.pop(cache_key, None)
+        if self.db_path:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+    
+    def clear(self):
+        """Drop every cached response from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM responses")
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters, hit rate and current memory tier size"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+    
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,48 +1,415 @@
 
 
+import logging
+import queue
 import requests
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 from config import Config
+from aiml_cache import ResponseCache, make_cache_key
+from aiml_concurrency import RateLimiter, SingleFlight
+from aiml_prompts import DEFAULT_PROMPT_BUDGET, PROMPT_BUDGETS, clean_problem_text, estimate_tokens, fit_inputs
+from circuit_breaker import CircuitBreaker, CircuitCall, CircuitOpenError
 import json
 import re
 
+# Tasks analyze_problem_bundle can combine, with the JSON value requested for each
+BUNDLE_TASKS = {
+    "analysis": "an object with problem_type, algorithms, complexity_targets, similar_problems and "
+                "hints (approach hints that do not give away the solution)",
+    "difficulty": 'an object with estimated_difficulty ("Easy", "Medium" or "Hard") and assessment '
+                  "(reasoning from the algorithms, implementation effort and skills required)",
+    "template": "an object with template: a {language} solution template as a string, with the function "
+                "signature, structure comments and test cases but NOT the complete solution"
+}
+
+# Latency SLO per method in seconds: the request timeout, and the time past which a reply
+# that did arrive still counts as a failure for the circuit breaker
+METHOD_TIMEOUTS = {
+    "analyze_problem": 15,
+    "generate_solution_template": 15,
+    "get_problem_difficulty_estimate": 10,
+    "review_solution": 25,
+    "suggest_optimizations": 20,
+    "explain_algorithm": 20,
+    "generate_test_cases": 20,
+    "analyze_problem_bundle": 25
+}
+DEFAULT_TIMEOUT = 30
+
+# Phrases that point at harder problems, for the offline difficulty estimate
+HARD_SIGNALS = (
+    "dynamic programming", "segment tree", "fenwick", "binary indexed tree", "bitmask", "strongly connected",
+    "maximum flow", "minimum cost", "minimize the maximum", "maximize the minimum", "median", "subsequences",
+    "number of ways", "modulo 10^9 + 7", "modulo 10^9+7", "shortest path", "topological"
+)
+MEDIUM_SIGNALS = (
+    "subarray", "substring", "subsequence", "binary search", "graph", "tree", "interval", "matrix", "grid",
+    "linked list", "heap", "priority queue", "sliding window", "permutation", "combination", "greedy",
+    "stack", "k-th", "kth", "minimum number", "maximum number"
+)
+
+
+@lru_cache(maxsize=None)
+def _get_default_cache() -> Optional[ResponseCache]:
+    """The process-wide response cache configured in Config, or None when disabled"""
+    if not Config.AIML_CACHE_ENABLED:
+        return None
+    return ResponseCache(Config.AIML_CACHE_PATH or None, Config.AIML_CACHE_SIZE, Config.AIML_CACHE_TTL)
+
+
+# Shared by every client in the process, so identical requests from different users coalesce
+_single_flight = SingleFlight()
+
+
+@lru_cache(maxsize=None)
+def _get_rate_limiter() -> RateLimiter:
+    """The process-wide limiter for the AIML API key's request and token quotas"""
+    return RateLimiter(Config.AIML_REQUESTS_PER_MINUTE, Config.AIML_TOKENS_PER_MINUTE, Config.AIML_MAX_IN_FLIGHT)
+
+
+@lru_cache(maxsize=None)
+def _get_circuit_breaker() -> CircuitBreaker:
+    """The process-wide circuit breaker for the AIML backend"""
+    return CircuitBreaker("AIML API", Config.AIML_BREAKER_FAILURES, Config.AIML_BREAKER_RECOVERY)
+
+
 class AIMLClient:
-    """AI/ML client for LeetCode problem assistance using AIML API"""
+    """AI/ML client for LeetCode problem assistance using AIML API
     
-    def __init__(self):
+    Completions are cached by model, temperature and normalized prompt (see
+    aiml_cache), so the same problem analyzed for several users costs one request.
+    Methods listed in Config.AIML_CACHE_EXCLUDE always call the API. Identical
+    requests that are already in flight are not sent again: concurrent callers
+    wait for the first one and share its response. Every API call passes through a
+    process-wide rate limiter (requests and tokens per minute, requests in flight),
+    and the map_* methods run many calls on a worker pool. Problem statements and
+    code are cleaned and trimmed to a per-method token budget (see aiml_prompts)
+    before they are put into prompts.
+    
+    A circuit breaker watches the backend: after repeated errors or replies slower
+    than a method's latency SLO (METHOD_TIMEOUTS), calls fail fast for a while
+    instead of waiting for timeouts, and are answered from the cache (stale
+    entries included) or, for difficulty estimates, by a local heuristic.
+    """
+    
+    def __init__(self, cache: ResponseCache = None):
         self.api_key = Config.AIML_API_KEY
         self.base_url = "https://api.aimlapi.com/chat/completions"
         self.model = "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo"
+        self.max_tokens = 2048
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.cache = cache if cache is not None else _get_default_cache()
+        self.uncached_methods = set(Config.AIML_CACHE_EXCLUDE)
+        self.single_flight = _single_flight if Config.AIML_COALESCE_REQUESTS else None
+        self.rate_limiter = _get_rate_limiter()
+        self.circuit_breaker = _get_circuit_breaker()
+        self.method_timeouts = {**METHOD_TIMEOUTS, **Config.AIML_METHOD_TIMEOUTS}
+        self.prompt_budgets = {**PROMPT_BUDGETS, **Config.AIML_PROMPT_BUDGETS}
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"api_requests": 0, "cache_bypassed": 0, "coalesced": 0, "bundle_fallbacks": 0,
+                         "degraded_responses": 0}
+        # method -> prompt input token counters
+        self._prompt_metrics: Dict[str, Dict] = {}
+    
+    def _count(self, counter: str):
+        with self._metrics_lock:
+            self._metrics[counter] += 1
+    
+    def get_metrics(self) -> Dict:
+        """Request counters, response cache statistics and process-wide coalescing counts"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["cache"] = self.cache.stats() if self.cache is not None else None
+        metrics["single_flight"] = self.single_flight.stats() if self.single_flight is not None else None
+        metrics["rate_limiter"] = self.rate_limiter.stats()
+        metrics["circuit_breaker"] = self.circuit_breaker.stats()
+        with self._metrics_lock:
+            metrics["prompt_budget"] = {method: dict(counters) for method, counters in self._prompt_metrics.items()}
+        return metrics
     
-    def _make_api_request(self, messages: List[Dict], temperature: float = 0.3) -> Dict:
-        """Make a request to the AIML API"""
+    def _estimate_tokens(self, messages: List[Dict]) -> int:
+        """Estimated prompt tokens plus the completion allowance"""
+        return sum(estimate_tokens(message.get("content", "")) for message in messages) + self.max_tokens
+    
+    def _fit_prompt_inputs(self, method: str, **inputs: str) -> Dict[str, str]:
+        """Clean and trim a method's prompt inputs to its token budget, recording the tokens saved"""
+        fitted, report = fit_inputs(inputs, self.prompt_budgets.get(method, DEFAULT_PROMPT_BUDGET))
+        with self._metrics_lock:
+            counters = self._prompt_metrics.setdefault(
+                method, {"requests": 0, "tokens_before": 0, "tokens_after": 0, "tokens_saved": 0, "truncated": 0}
+            )
+            counters["requests"] += 1
+            counters["tokens_before"] += report["tokens_before"]
+            counters["tokens_after"] += report["tokens_after"]
+            counters["tokens_saved"] += report["tokens_saved"]
+            counters["truncated"] += bool(report["truncated"])
+        
+        if report["tokens_saved"]:
+            truncated = f", truncated {', '.join(report['truncated'])}" if report["truncated"] else ""
+            self.logger.debug(
+                f"{method} prompt inputs: {report['tokens_before']} -> {report['tokens_after']} tokens "
+                f"({report['tokens_saved']} saved{truncated})"
+            )
+        return fitted
+    
+    @staticmethod
+    def _usage_tokens(response: Dict) -> Optional[int]:
+        usage = response.get("usage") or {}
+        return usage.get("total_tokens")
+    
+    def _make_api_request(self, messages: List[Dict], temperature: float = 0.3, method: str = None) -> Dict:
+        """Make a request to the AIML API, served from the response cache when possible
+        
+        method names the calling AIMLClient method, for per-method cache opt-out.
+        Methods that opt out are not coalesced either, since their answers are sampled.
+        """
+        request_key, cached = self._lookup_cache(messages, temperature, method)
+        if cached is not None:
+            return cached
+        
+        try:
+            if request_key is None or self.single_flight is None:
+                return self._fetch_completion(messages, temperature, request_key, method)
+            
+            response, shared = self.single_flight.do(
+                (self.base_url, request_key),
+                lambda: self._lead_completion(messages, temperature, request_key, method)
+            )
+        except CircuitOpenError:
+            stale = self._stale_response(request_key)
+            if stale is None:
+                raise
+            return stale
+        
+        if shared:
+            self._count("coalesced")
+        return response
+    
+    def _stale_response(self, request_key: Optional[str]) -> Optional[Dict]:
+        """An expired cached response to serve while the circuit is open, if there is one"""
+        if request_key is None or self.cache is None:
+            return None
+        stale = self.cache.get(request_key, allow_stale=True)
+        if stale is not None:
+            self._count("degraded_responses")
+        return stale
+    
+    def _lookup_cache(self, messages: List[Dict], temperature: float, method: str):
+        """Return (request key, or None for methods that opt out of caching; cached response or None)"""
+        if method in self.uncached_methods:
+            self._count("cache_bypassed")
+            return None, None
+        request_key = make_cache_key(self.model, temperature, self.max_tokens, messages)
+        if self.cache is None:
+            return request_key, None
+        return request_key, self.cache.get(request_key)
+    
+    def _lead_completion(self, messages: List[Dict], temperature: float, request_key: str, method: str) -> Dict:
+        """Run as the single-flight leader: the previous leader may have cached the answer since our miss"""
+        cached = self.cache.get(request_key, count_miss=False) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        return self._fetch_completion(messages, temperature, request_key, method)
+    
+    def _fetch_completion(self, messages: List[Dict], temperature: float, request_key: Optional[str],
+                          method: str = None) -> Dict:
+        """Request a completion and cache it under request_key"""
+        response = self._post_completion(messages, temperature, method)
+        if request_key is not None and self.cache is not None and response.get("choices"):
+            self.cache.put(request_key, response)
+        return response
+    
+    def _stream_api_request(self, messages: List[Dict], temperature: float = 0.3,
+                            method: str = None) -> Generator[str, None, str]:
+        """Stream a completion from the AIML API, yielding text chunks as they arrive
+        
+        Returns the full text once the stream ends. A cached completion is yielded
+        in one chunk, and a finished stream is cached like a regular response.
+        """
+        request_key, cached = self._lookup_cache(messages, temperature, method)
+        if cached is None:
+            try:
+                with self.circuit_breaker.attempt() as call:
+                    return (yield from self._stream_completion(messages, temperature, request_key, call))
+            except CircuitOpenError:
+                cached = self._stale_response(request_key)
+                if cached is None:
+                    raise
+        content = cached["choices"][0]["message"]["content"]
+        yield content
+        return content
+    
+    def _stream_completion(self, messages: List[Dict], temperature: float, request_key: Optional[str],
+                           call: CircuitCall) -> Generator[str, None, str]:
+        """Stream one completion, reporting its outcome to the circuit breaker through call
+        
+        A reader thread drives the HTTP response inside its rate-limiter slot and
+        hands text over through a queue, so the slot is freed when the server
+        finishes rather than at the pace of whoever consumes this generator.
+        """
+        self._count("api_requests")
+        events = queue.Queue()
+        stop = threading.Event()
+        threading.Thread(target=self._read_stream, args=(messages, temperature, request_key, events, stop),
+                         name="aiml-stream", daemon=True).start()
+        chunks = []
+        finished = False
+        try:
+            while True:
+                kind, value = events.get()
+                if kind == "done":
+                    finished = True
+                    break
+                if kind == "error":
+                    if isinstance(value, requests.exceptions.RequestException):
+                        self._record_request_error(call, value)
+                        raise Exception(f"AIML API request failed: {str(value)}")
+                    if isinstance(value, json.JSONDecodeError):
+                        call.failure()
+                        raise Exception(f"Invalid JSON in AIML API stream: {str(value)}")
+                    call.failure()
+                    raise value
+                chunks.append(value)
+                yield value
+        finally:
+            # Tells the reader to stop early if the consumer went away
+            stop.set()
+            # Streams are long by design, so only errors (not duration) count against the breaker.
+            # A consumer that stops early leaves a stream that was delivering text a success,
+            # and one that had not produced anything yet without a verdict.
+            if finished or chunks:
+                call.success()
+            else:
+                call.release()
+        
+        return "".join(chunks)
+    
+    def _read_stream(self, messages: List[Dict], temperature: float, request_key: Optional[str],
+                     events: queue.Queue, stop: threading.Event):
+        """Read a streamed completion into events as ("text", str), then ("done", None) or ("error", exc)"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True
+        }
+        chunks = []
+        estimated = self._estimate_tokens(messages)
+        usage = None
+        try:
+            with self.rate_limiter.slot(estimated):
+                # The read timeout applies between chunks, so long completions are not cut off
+                with requests.post(self.base_url, headers=self.headers, json=payload, stream=True,
+                                   timeout=(10, Config.AIML_STREAM_TIMEOUT)) as response:
+                    response.raise_for_status()
+                    # chunk_size=None hands over each chunked-encoding chunk as soon as it arrives
+                    for raw_line in response.iter_lines(chunk_size=None):
+                        if stop.is_set():
+                            break
+                        # SSE is always UTF-8; requests would guess ISO-8859-1 (or hand over bytes)
+                        # for a text/event-stream response without a charset
+                        line = raw_line.decode("utf-8", errors="replace")
+                        # Server-sent events: "data: {...}" lines, blank separators and ": keep-alive" comments
+                        if not line or not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        event = json.loads(data)
+                        usage = self._usage_tokens(event) or usage
+                        choices = event.get("choices") or [{}]
+                        text = (choices[0].get("delta") or {}).get("content")
+                        if text:
+                            chunks.append(text)
+                            events.put(("text", text))
+        except Exception as e:
+            events.put(("error", e))
+            return
+        finally:
+            # Streams rarely report usage; fall back to the prompt estimate plus the text received
+            self.rate_limiter.record_usage(
+                estimated, usage or estimated - self.max_tokens + estimate_tokens("".join(chunks))
+            )
+        
+        content = "".join(chunks)
+        if not stop.is_set() and request_key is not None and self.cache is not None and content:
+            self.cache.put(request_key, {"choices": [{"message": {"role": "assistant", "content": content}}]})
+        events.put(("done", None))
+    
+    def _post_completion(self, messages: List[Dict], temperature: float, method: str = None) -> Dict:
+        """Send one chat completion request, within the method's latency SLO"""
+        # Raises CircuitOpenError without touching the network while the backend is failing
+        with self.circuit_breaker.attempt() as call:
+            return self._send_completion(messages, temperature, method, call)
+    
+    def _send_completion(self, messages: List[Dict], temperature: float, method: Optional[str],
+                         call: CircuitCall) -> Dict:
+        """Post the request and report its outcome and latency through call"""
+        self._count("api_requests")
+        timeout = self.method_timeouts.get(method, DEFAULT_TIMEOUT)
+        estimated = self._estimate_tokens(messages)
+        # A request that fails used at most its prompt
+        actual = estimated - self.max_tokens
         try:
             payload = {
                 "model": self.model,
                 "messages": messages,
                 "temperature": temperature,
-                "max_tokens": 2048,
+                "max_tokens": self.max_tokens,
                 "stream": False
             }
             
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            with self.rate_limiter.slot(estimated):
+                started = time.monotonic()
+                response = requests.post(
+                    self.base_url,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=timeout
+                )
+                elapsed = time.monotonic() - started
             response.raise_for_status()
             
-            return response.json()
-            
+            data = response.json()
+            actual = self._usage_tokens(data) or estimated
+        
         except requests.exceptions.RequestException as e:
+            self._record_request_error(call, e)
             raise Exception(f"AIML API request failed: {str(e)}")
         except json.JSONDecodeError as e:
+            call.failure()
             raise Exception(f"Invalid JSON response from AIML API: {str(e)}")
+        finally:
+            # Give back the unused part of the completion allowance, failed requests included
+            self.rate_limiter.record_usage(estimated, actual)
+        
+        # requests' timeout bounds each socket read, so a trickling reply can still overrun the SLO
+        if elapsed > timeout:
+            call.failure(slow=True)
+        else:
+            call.success()
+        return data
+    
+    @staticmethod
+    def _record_request_error(call: CircuitCall, error: requests.exceptions.RequestException):
+        """Count an error against the circuit breaker unless the backend answered a client error"""
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None and status < 500 and status != 429:
+            # The service is up; the request itself was rejected
+            call.success()
+        else:
+            call.failure()
     
     def analyze_problem(self, problem_text: str, difficulty: str = "") -> Dict:
         """Analyze a LeetCode problem and provide insights"""
@@ -68,7 +435,7 @@ class AIMLClient:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, temperature=0.3)
+            response = self._make_api_request(messages, temperature=0.3, method="analyze_problem")
             content = response["choices"][0]["message"]["content"]
             
             # Try to parse as JSON, fallback to structured text
@@ -101,7 +468,7 @@ class AIMLClient:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, temperature=0.2)
+            response = self._make_api_request(messages, temperature=0.2, method="generate_solution_template")
             template = response["choices"][0]["message"]["content"]
             
             return {
@@ -113,10 +480,10 @@ class AIMLClient:
         except Exception as e:
             return {"error": f"Template generation failed: {str(e)}", "success": False}
     
-    def review_solution(self, problem_text: str, solution_code: str, language: str = "python") -> Dict:
-        """Review and provide feedback on a solution"""
-        try:
-            prompt = f"""
+    def _review_solution_messages(self, problem_text: str, solution_code: str, language: str) -> List[Dict]:
+        inputs = self._fit_prompt_inputs("review_solution", problem_text=problem_text, solution_code=solution_code)
+        problem_text, solution_code = inputs["problem_text"], inputs["solution_code"]
+        prompt = f"""
             Review this LeetCode solution and provide constructive feedback:
             
             Problem: {problem_text}
@@ -134,33 +501,49 @@ class AIMLClient:
             
             Provide specific, actionable feedback.
             """
-            
-            messages = [
-                {"role": "system", "content": "You are an expert code reviewer specializing in algorithms and data structures."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_api_request(messages, temperature=0.3)
+        
+        return [
+            {"role": "system", "content": "You are an expert code reviewer specializing in algorithms and data structures."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _review_solution_result(self, feedback: str) -> Dict:
+        # Extract complexity information if mentioned
+        time_complexity = self._extract_complexity(feedback, "time")
+        space_complexity = self._extract_complexity(feedback, "space")
+        
+        return {
+            "feedback": feedback,
+            "time_complexity": time_complexity,
+            "space_complexity": space_complexity,
+            "success": True
+        }
+    
+    def review_solution(self, problem_text: str, solution_code: str, language: str = "python") -> Dict:
+        """Review and provide feedback on a solution"""
+        try:
+            messages = self._review_solution_messages(problem_text, solution_code, language)
+            response = self._make_api_request(messages, temperature=0.3, method="review_solution")
             feedback = response["choices"][0]["message"]["content"]
-            
-            # Extract complexity information if mentioned
-            time_complexity = self._extract_complexity(feedback, "time")
-            space_complexity = self._extract_complexity(feedback, "space")
-            
-            return {
-                "feedback": feedback,
-                "time_complexity": time_complexity,
-                "space_complexity": space_complexity,
-                "success": True
-            }
-            
+            return self._review_solution_result(feedback)
+        
         except Exception as e:
             return {"error": f"Solution review failed: {str(e)}", "success": False}
     
-    def suggest_optimizations(self, solution_code: str, language: str = "python") -> Dict:
-        """Suggest optimizations for existing solution"""
+    def stream_review_solution(self, problem_text: str, solution_code: str,
+                               language: str = "python") -> Generator[str, None, Dict]:
+        """Stream review feedback as it is generated; returns the review_solution dict"""
         try:
-            prompt = f"""
+            messages = self._review_solution_messages(problem_text, solution_code, language)
+            feedback = yield from self._stream_api_request(messages, temperature=0.3, method="review_solution")
+            return self._review_solution_result(feedback)
+        
+        except Exception as e:
+            return {"error": f"Solution review failed: {str(e)}", "success": False}
+    
+    def _suggest_optimizations_messages(self, solution_code: str, language: str) -> List[Dict]:
+        solution_code = self._fit_prompt_inputs("suggest_optimizations", solution_code=solution_code)["solution_code"]
+        prompt = f"""
             Analyze this {language} solution and suggest specific optimizations:
             
             {solution_code}
@@ -174,27 +557,43 @@ class AIMLClient:
             
             Provide concrete suggestions with explanations.
             """
-            
-            messages = [
-                {"role": "system", "content": "You are an algorithm optimization expert."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_api_request(messages, temperature=0.3)
+        
+        return [
+            {"role": "system", "content": "You are an algorithm optimization expert."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def suggest_optimizations(self, solution_code: str, language: str = "python") -> Dict:
+        """Suggest optimizations for existing solution"""
+        try:
+            messages = self._suggest_optimizations_messages(solution_code, language)
+            response = self._make_api_request(messages, temperature=0.3, method="suggest_optimizations")
             suggestions = response["choices"][0]["message"]["content"]
             
             return {
                 "suggestions": suggestions,
                 "success": True
             }
-            
+        
         except Exception as e:
             return {"error": f"Optimization suggestions failed: {str(e)}", "success": False}
     
-    def explain_algorithm(self, algorithm_name: str, context: str = "") -> Dict:
-        """Explain an algorithm in the context of LeetCode problems"""
+    def stream_suggest_optimizations(self, solution_code: str, language: str = "python") -> Generator[str, None, Dict]:
+        """Stream optimization suggestions as they are generated; returns the suggest_optimizations dict"""
         try:
-            prompt = f"""
+            messages = self._suggest_optimizations_messages(solution_code, language)
+            suggestions = yield from self._stream_api_request(messages, temperature=0.3, method="suggest_optimizations")
+            
+            return {
+                "suggestions": suggestions,
+                "success": True
+            }
+        
+        except Exception as e:
+            return {"error": f"Optimization suggestions failed: {str(e)}", "success": False}
+    
+    def _explain_algorithm_messages(self, algorithm_name: str, context: str) -> List[Dict]:
+        prompt = f"""
             Explain the {algorithm_name} algorithm in the context of LeetCode problems:
             {context}
             
@@ -207,13 +606,17 @@ class AIMLClient:
             
             Keep it practical and focused on competitive programming.
             """
-            
-            messages = [
-                {"role": "system", "content": "You are an algorithms tutor specializing in competitive programming."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_api_request(messages, temperature=0.3)
+        
+        return [
+            {"role": "system", "content": "You are an algorithms tutor specializing in competitive programming."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def explain_algorithm(self, algorithm_name: str, context: str = "") -> Dict:
+        """Explain an algorithm in the context of LeetCode problems"""
+        try:
+            messages = self._explain_algorithm_messages(algorithm_name, context)
+            response = self._make_api_request(messages, temperature=0.3, method="explain_algorithm")
             explanation = response["choices"][0]["message"]["content"]
             
             return {
@@ -221,13 +624,30 @@ class AIMLClient:
                 "algorithm": algorithm_name,
                 "success": True
             }
+        
+        except Exception as e:
+            return {"error": f"Algorithm explanation failed: {str(e)}", "success": False}
+    
+    def stream_explain_algorithm(self, algorithm_name: str, context: str = "") -> Generator[str, None, Dict]:
+        """Stream an algorithm explanation as it is generated; returns the explain_algorithm dict"""
+        try:
+            messages = self._explain_algorithm_messages(algorithm_name, context)
+            explanation = yield from self._stream_api_request(messages, temperature=0.3, method="explain_algorithm")
             
+            return {
+                "explanation": explanation,
+                "algorithm": algorithm_name,
+                "success": True
+            }
+        
         except Exception as e:
             return {"error": f"Algorithm explanation failed: {str(e)}", "success": False}
     
     def generate_test_cases(self, problem_text: str, solution_code: str) -> Dict:
         """Generate additional test cases for a problem"""
         try:
+            inputs = self._fit_prompt_inputs("generate_test_cases", problem_text=problem_text, solution_code=solution_code)
+            problem_text, solution_code = inputs["problem_text"], inputs["solution_code"]
             prompt = f"""
             Generate comprehensive test cases for this problem:
             
@@ -248,7 +668,7 @@ class AIMLClient:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, temperature=0.4)
+            response = self._make_api_request(messages, temperature=0.4, method="generate_test_cases")
             test_cases = response["choices"][0]["message"]["content"]
             
             return {
@@ -289,7 +709,7 @@ class AIMLClient:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, temperature=0.2)
+            response = self._make_api_request(messages, temperature=0.2, method="get_problem_difficulty_estimate")
             assessment = response["choices"][0]["message"]["content"]
             
             # Extract difficulty rating
@@ -305,5 +725,183 @@ class AIMLClient:
                 "success": True
             }
             
+        except CircuitOpenError:
+            return self._heuristic_difficulty_estimate(problem_text)
         except Exception as e:
-            return {"error": f"Difficulty estimation failed: {str(e)}", "success": False}
\ No newline at end of file
+            return {"error": f"Difficulty estimation failed: {str(e)}", "success": False}
+    
+    def _heuristic_difficulty_estimate(self, problem_text: str) -> Dict:
+        """Estimate difficulty from keywords and constraint sizes, without the API"""
+        self._count("degraded_responses")
+        text = clean_problem_text(problem_text).lower()
+        hard = [signal for signal in HARD_SIGNALS if signal in text]
+        medium = [signal for signal in MEDIUM_SIGNALS if signal in text]
+        score = 2 * len(hard) + len(medium)
+        
+        # Inputs up to 10^5 and beyond rule out brute force
+        exponents = [int(e) for e in re.findall(r"10\s*\^\s*(\d+)", text)]
+        large_input = any(5 <= e <= 6 for e in exponents)
+        score += large_input
+        
+        difficulty = "Easy" if score <= 1 else "Medium" if score <= 5 else "Hard"
+        reasons = hard + medium + (["input sizes up to 10^5 or more"] if large_input else [])
+        return {
+            "estimated_difficulty": difficulty,
+            "assessment": "Estimated offline while the AI service is unavailable"
+                          + (f", from: {', '.join(reasons)}" if reasons else "") + ".",
+            "success": True,
+            "degraded": True
+        }
+    
+    def analyze_problem_bundle(self, problem_text: str, language: str = "python", tasks: List[str] = None,
+                               difficulty: str = "") -> Dict:
+        """Run several problem tasks in one completion
+        
+        tasks is a subset of BUNDLE_TASKS (all by default): "analysis", "difficulty"
+        and "template". The problem statement is sent once and the model answers
+        with one JSON object, which is split back into the dicts analyze_problem,
+        get_problem_difficulty_estimate and generate_solution_template return.
+        Returns {task: result}. Tasks whose part of the answer is missing or
+        malformed are rerun on their own.
+        """
+        tasks = list(dict.fromkeys(tasks or BUNDLE_TASKS))
+        unknown = [task for task in tasks if task not in BUNDLE_TASKS]
+        if unknown:
+            raise ValueError(f"Unknown bundle tasks: {', '.join(unknown)}")
+        
+        sections = "\n".join(
+            f'"{task}": {BUNDLE_TASKS[task].format(language=language)}' for task in tasks
+        )
+        prompt = f"""
+            Answer several questions about this LeetCode problem in a single JSON object.
+            
+            Problem: {problem_text}
+            Difficulty: {difficulty}
+            
+            Return only a JSON object with exactly these keys:
+            {sections}
+            """
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful coding assistant specializing in algorithm analysis. "
+                                          "You always answer with valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        try:
+            response = self._make_api_request(messages, temperature=0.2, method="analyze_problem_bundle")
+        except Exception as e:
+            # The API itself failed; rerunning every task separately would only add load
+            return {
+                task: self._heuristic_difficulty_estimate(problem_text)
+                if task == "difficulty" and isinstance(e, CircuitOpenError) else self._bundle_error(task, e)
+                for task in tasks
+            }
+        
+        try:
+            bundle = self._parse_json_object(response["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError):
+            bundle = None
+        if bundle is None:
+            # Do not keep serving a malformed answer from the cache
+            if self.cache is not None:
+                self.cache.delete(make_cache_key(self.model, 0.2, self.max_tokens, messages))
+            bundle = {}
+        
+        results = {}
+        for task in tasks:
+            result = self._split_bundle_task(task, bundle.get(task), language)
+            if result is None:
+                self._count("bundle_fallbacks")
+                result = self._run_bundle_task(task, problem_text, language, difficulty)
+            results[task] = result
+        return results
+    
+    @staticmethod
+    def _parse_json_object(content: str) -> Optional[Dict]:
+        """The JSON object in a completion, tolerating code fences and surrounding prose"""
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end < start:
+            return None
+        try:
+            parsed = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    
+    def _split_bundle_task(self, task: str, value, language: str) -> Optional[Dict]:
+        """Shape one task's part of a bundle like its individual method, or None if unusable"""
+        if task == "analysis":
+            if isinstance(value, dict) and value:
+                return value
+            if isinstance(value, str) and value.strip():
+                return {"analysis": value, "format": "text"}
+            return None
+        
+        if task == "difficulty":
+            if not isinstance(value, dict):
+                return None
+            assessment = value.get("assessment")
+            estimated = str(value.get("estimated_difficulty", "")).capitalize()
+            if not isinstance(assessment, str) or estimated not in ("Easy", "Medium", "Hard"):
+                return None
+            return {"estimated_difficulty": estimated, "assessment": assessment, "success": True}
+        
+        if task == "template":
+            template = value.get("template") if isinstance(value, dict) else value
+            if not isinstance(template, str) or not template.strip():
+                return None
+            return {"template": template, "language": language, "success": True}
+        return None
+    
+    def _run_bundle_task(self, task: str, problem_text: str, language: str, difficulty: str) -> Dict:
+        if task == "analysis":
+            return self.analyze_problem(problem_text, difficulty)
+        if task == "difficulty":
+            return self.get_problem_difficulty_estimate(problem_text)
+        return self.generate_solution_template(problem_text, language)
+    
+    @staticmethod
+    def _bundle_error(task: str, error: Exception) -> Dict:
+        if task == "analysis":
+            return {"error": f"AI analysis failed: {str(error)}"}
+        if task == "difficulty":
+            return {"error": f"Difficulty estimation failed: {str(error)}", "success": False}
+        return {"error": f"Template generation failed: {str(error)}", "success": False}
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.rate_limiter.max_in_flight,
+                                                    thread_name_prefix="aiml")
+            return self._executor
+    
+    def _map(self, func, items: Iterable[Dict], make_args) -> Iterator[Tuple[Dict, Dict]]:
+        """Run func(*make_args(item)) for every item on the worker pool, yielding (item, result) as each finishes"""
+        executor = self._get_executor()
+        futures = {executor.submit(func, *make_args(item)): item for item in items}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # The caller stopped early: drop the calls that have not started
+            for future in futures:
+                future.cancel()
+    
+    def map_review_solutions(self, items: Iterable[Dict]) -> Iterator[Tuple[Dict, Dict]]:
+        """Review many solutions concurrently, yielding (item, review_solution result) as each completes
+        
+        Each item is a dict with problem_text, solution_code and optionally language.
+        Concurrency and pacing follow AIML_MAX_IN_FLIGHT and the per-minute limits.
+        """
+        return self._map(
+            self.review_solution, items,
+            lambda item: (item.get("problem_text", ""), item["solution_code"], item.get("language", "python"))
+        )
+    
+    def close(self):
+        """Shut down the worker pool used by the map_* methods"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,152 @@
+
+
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution
+    
+    The first caller for a key (the leader) runs the function; callers that arrive
+    while it is still running wait on the leader's future and receive the same
+    result, or the same exception. Nothing is remembered once the call finishes, so
+    this only deduplicates overlapping calls and needs no invalidation.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._counters = {"executed": 0, "coalesced": 0}
+    
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """Run func for key, or join the call already running; returns (result, shared)"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self._counters["executed"] += 1
+                leader = True
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+    
+    def stats(self) -> Dict:
+        """Calls executed, calls that joined an in-flight one, and keys running now"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._in_flight)
+        return stats
+
+
+class TokenBucket:
+    """Blocking token bucket refilled continuously at per_minute tokens per minute
+    
+    The bucket starts full and holds at most capacity tokens (default: one
+    minute's worth), which is the largest burst allowed. A rate of 0 or less
+    disables the limit.
+    """
+    
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.per_minute = per_minute
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+    
+    def acquire(self, amount: float = 1) -> float:
+        """Take amount tokens, waiting until they are available; returns seconds waited"""
+        if self.per_minute <= 0:
+            return 0.0
+        # A request larger than the bucket could never run; let it through on a full bucket
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return time.monotonic() - started
+                self._condition.wait((amount - self._tokens) * 60 / self.per_minute)
+    
+    def adjust(self, delta: float):
+        """Take delta more tokens (or return them if negative), e.g. once actual usage is known"""
+        if self.per_minute <= 0:
+            return
+        with self._condition:
+            self._refill()
+            # May go negative: an underestimate is paid back before the next request
+            self._tokens = min(self.capacity, self._tokens - delta)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a cap on requests in flight
+    
+    Each request reserves an estimated token count up front; record_usage settles
+    the difference once the provider reports what the request actually used.
+    """
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_in_flight: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "in_flight": 0, "throttled": 0, "throttled_seconds": 0.0}
+    
+    @contextmanager
+    def slot(self, estimated_tokens: float) -> Iterator[None]:
+        """Hold an in-flight slot and the rate budget for one request"""
+        self._slots.acquire()
+        try:
+            waited = self.requests.acquire(1) + self.tokens.acquire(estimated_tokens)
+            with self._lock:
+                self._counters["requests"] += 1
+                self._counters["in_flight"] += 1
+                if waited > 0.001:
+                    self._counters["throttled"] += 1
+                    self._counters["throttled_seconds"] += waited
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._counters["in_flight"] -= 1
+        finally:
+            self._slots.release()
+    
+    def record_usage(self, estimated_tokens: float, actual_tokens: float):
+        """Settle a request's token reservation against what it really used"""
+        self.tokens.adjust(actual_tokens - estimated_tokens)
+    
+    def stats(self) -> Dict:
+        """Requests started, requests in flight now, and how many waited for the rate limit and for how long"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        return stats
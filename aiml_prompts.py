@@ -0,0 +1,175 @@
+
+
+import html
+import re
+from typing import Dict, List, Tuple
+
+# Token budget for the variable inputs (problem statement, code) of each AIMLClient method;
+# the fixed instructions around them are small and not counted
+PROMPT_BUDGETS = {
+    "review_solution": 3000,
+    "suggest_optimizations": 2500,
+    "generate_test_cases": 2000
+}
+DEFAULT_PROMPT_BUDGET = 3000
+
+# Examples beyond this many are dropped from problem statements; the model only needs the format
+MAX_EXAMPLES = 2
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_BLOCK_TAGS = re.compile(r"<\s*(br|/p|/div|/li|/pre|/h\d|/tr)\b[^<>\n]*>", re.IGNORECASE)
+_HIDDEN_ELEMENTS = re.compile(r"<(script|style)\b[^<>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+# Only HTML elements found in problem descriptions, on one line, so comparisons in plain-text
+# statements ("1 <= n <= 10^5", "i<j and j>k") are never mistaken for tags
+_TAG = re.compile(
+    r"</?(a|b|blockquote|br|code|div|em|font|h[1-6]|hr|i|img|li|ol|p|pre|span|strong|sub|sup|"
+    r"table|tbody|td|th|thead|tr|u|ul)(\s+[\w-]+(=(\"[^\"\n]*\"|'[^'\n]*'|[^\s<>]+))?)*\s*/?>",
+    re.IGNORECASE
+)
+_SUPERSCRIPT = re.compile(r"<sup>\s*(.*?)\s*</sup>", re.IGNORECASE)
+_EXAMPLE_HEADER = re.compile(r"^\s*Example\s*\d+\s*:", re.IGNORECASE)
+_SECTION_HEADER = re.compile(r"^\s*(Example\s*\d+|Constraints|Follow[- ]up|Note)\s*:?", re.IGNORECASE)
+# Page chrome that comes along when a LeetCode description is scraped
+_BOILERPLATE_LINE = re.compile(
+    r"^\s*(Seen this question in a real interview before\?.*|Accepted(\s*[\d.,]+[KM]?)?|Submissions(\s*[\d.,]+[KM]?)?|"
+    r"Acceptance Rate(\s*[\d.]+%)?|Topics|Companies|Hint \d+|Discussion \(\d+\)|Copyright ©.*|\d+/\d+)\s*$",
+    re.IGNORECASE
+)
+# A statistic printed on the line after its label ("Accepted" / "3.2M")
+_STAT_VALUE = re.compile(r"^\s*[\d.,]+\s*[KM]?%?\s*$", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the model's token count without a tokenizer
+    
+    Words and punctuation marks count as tokens, with long words split every four
+    characters as BPE vocabularies tend to. Good to within about 15% on English
+    prose and code, which is all budgeting needs.
+    """
+    if not text:
+        return 0
+    return sum(1 + (len(token) - 1) // 4 for token in _TOKEN_PATTERN.findall(text))
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Trim trailing spaces, squeeze runs of spaces and blank lines"""
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.replace("\r\n", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def clean_problem_text(text: str) -> str:
+    """Strip HTML, page chrome and extra examples from a problem statement"""
+    if not text:
+        return ""
+    if "<" in text and _TAG.search(text):
+        text = _HIDDEN_ELEMENTS.sub("", text)
+        # Keep exponents in constraints readable: 10<sup>4</sup> -> 10^4
+        text = _SUPERSCRIPT.sub(r"^\1", text)
+        text = _BLOCK_TAGS.sub("\n", text)
+        text = _TAG.sub("", text)
+    text = html.unescape(text)
+    
+    kept: List[str] = []
+    examples = 0
+    skipping = False
+    after_boilerplate = False
+    for line in text.replace("\r\n", "\n").split("\n"):
+        if _BOILERPLATE_LINE.match(line) or (after_boilerplate and _STAT_VALUE.match(line)):
+            after_boilerplate = True
+            continue
+        after_boilerplate = False
+        if _SECTION_HEADER.match(line):
+            if _EXAMPLE_HEADER.match(line):
+                examples += 1
+                skipping = examples > MAX_EXAMPLES
+            else:
+                skipping = False
+        if not skipping:
+            kept.append(line)
+    return _collapse_whitespace("\n".join(kept))
+
+
+def clean_code(code: str) -> str:
+    """Drop trailing whitespace and runs of blank lines; indentation is kept"""
+    if not code:
+        return ""
+    lines = [line.rstrip() for line in code.replace("\r\n", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip("\n")
+
+
+CLEANERS = {
+    "problem_text": clean_problem_text,
+    "solution_code": clean_code
+}
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Shorten text to about budget tokens, keeping its beginning and end
+    
+    Two thirds of the budget go to the head (the statement or the function
+    signature) and one third to the tail (constraints, the end of the code),
+    cut at line boundaries where possible.
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return text
+    if budget <= 0:
+        return ""
+    chars_per_token = len(text) / tokens
+    head_chars = int(budget * 2 / 3 * chars_per_token)
+    tail_chars = int(budget / 3 * chars_per_token)
+    
+    head = text[:head_chars]
+    tail = text[len(text) - tail_chars:] if tail_chars else ""
+    if "\n" in head[head_chars // 2:]:
+        head = head[:head.rindex("\n")]
+    if "\n" in tail[:tail_chars // 2]:
+        tail = tail[tail.index("\n") + 1:]
+    return f"{head}\n... [{tokens - budget} tokens truncated] ...\n{tail}"
+
+
+def _allocate(sizes: Dict[str, int], budget: int) -> Dict[str, int]:
+    """Split a budget so small inputs keep everything and large ones share the rest evenly"""
+    allocation = {}
+    remaining = dict(sizes)
+    left = budget
+    while remaining:
+        share = left // len(remaining)
+        small = {name: size for name, size in remaining.items() if size <= share}
+        if not small:
+            for name in remaining:
+                allocation[name] = share
+            break
+        for name, size in small.items():
+            allocation[name] = size
+            left -= size
+            del remaining[name]
+    return allocation
+
+
+def fit_inputs(inputs: Dict[str, str], budget: int) -> Tuple[Dict[str, str], Dict]:
+    """Clean prompt inputs and trim them to a shared token budget
+    
+    inputs maps field names (e.g. problem_text, solution_code) to raw text.
+    Returns the fitted inputs and a report with tokens_before, tokens_after,
+    tokens_saved and the names of the fields that had to be truncated.
+    """
+    tokens_before = sum(estimate_tokens(text or "") for text in inputs.values())
+    cleaned = {name: CLEANERS.get(name, _collapse_whitespace)(text or "") for name, text in inputs.items()}
+    sizes = {name: estimate_tokens(text) for name, text in cleaned.items()}
+    
+    fitted = dict(cleaned)
+    truncated = []
+    if sum(sizes.values()) > budget:
+        for name, allowed in _allocate(sizes, budget).items():
+            if sizes[name] > allowed:
+                fitted[name] = truncate_to_tokens(cleaned[name], allowed)
+                truncated.append(name)
+    
+    tokens_after = sum(estimate_tokens(text) for text in fitted.values())
+    return fitted, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": max(0, tokens_before - tokens_after),
+        "truncated": truncated
+    }
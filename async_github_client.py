@@ -0,0 +1,221 @@
+
+
+import asyncio
+import base64
+import json
+import aiohttp
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from github_client import GitHubClient, IDEMPOTENT_METHODS, RATE_LIMIT_STATUS_CODES
+
+
+class AsyncGitHubClient:
+    """Asyncio GitHub API client that runs independent requests concurrently
+    
+    Mirrors GitHubClient's methods as coroutines. A semaphore bounds the number
+    of requests in flight; retry, backoff and rate-limit tracking follow the same
+    rules as GitHubClient and share its per-token rate-limit state.
+    
+    Use as an async context manager:
+        
+        async with AsyncGitHubClient(token) as github:
+            stats = await github.get_repositories_stats([("octocat", "hello-world")])
+    """
+    
+    def __init__(self, access_token: str, max_concurrency: int = None, pool_size: int = None,
+                 max_retries: int = None, backoff_factor: float = None, timeout: int = None):
+        self.access_token = access_token
+        self.max_concurrency = max_concurrency or Config.GITHUB_MAX_CONCURRENCY
+        self.pool_size = pool_size or Config.GITHUB_POOL_SIZE
+        
+        # The sync client supplies the retry policy, rate-limit state and solution formatting
+        self._sync = GitHubClient(access_token, pool_size=pool_size, max_retries=max_retries,
+                                  backoff_factor=backoff_factor, timeout=timeout)
+        self.base_url = self._sync.base_url
+        self.headers = self._sync.headers
+        self.timeout = self._sync.timeout
+        
+        self._session = None
+        self._semaphore = None
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self):
+        """Create the HTTP session; must be called from inside the event loop"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _request(self, method: str, path: str, idempotent: bool = None,
+                       **kwargs) -> Tuple[int, Optional[object]]:
+        """Send a request, retrying 5xx and rate-limit responses
+        
+        Returns (status, decoded JSON body or None).
+        """
+        await self.open()
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    async with self._session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        headers = response.headers
+                        body = await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not idempotent or attempt >= self._sync.max_retries:
+                    raise
+                await asyncio.sleep(self._sync._backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            self._sync._update_rate_limit(headers)
+            
+            rate_limit_body = body if status in RATE_LIMIT_STATUS_CODES else ""
+            delay = self._sync._retry_delay(idempotent, status, headers, rate_limit_body, attempt)
+            if delay is None:
+                data = None
+                if body:
+                    try:
+                        data = json.loads(body)
+                    except ValueError:
+                        data = None
+                return status, data
+            
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _request_json(self, method: str, path: str, **kwargs):
+        """Send a request and return its JSON body, raising on HTTP errors"""
+        status, data = await self._request(method, path, **kwargs)
+        if status >= 400:
+            message = data.get("message", "") if isinstance(data, dict) else ""
+            raise Exception(f"GitHub API {method} {path} returned {status}: {message}")
+        return data
+    
+    async def get_user_info(self) -> Dict:
+        """Get authenticated user information"""
+        return await self._request_json("GET", "/user")
+    
+    async def list_repositories(self, per_page: int = 30) -> List[Dict]:
+        """List user's repositories"""
+        return await self._request_json("GET", "/user/repos", params={"per_page": per_page, "sort": "updated"})
+    
+    async def create_repository(self, name: str, description: str = "", private: bool = False) -> Dict:
+        """Create a new repository"""
+        data = {
+            "name": name,
+            "description": description,
+            "private": private,
+            "auto_init": True,
+            "gitignore_template": "Python"
+        }
+        return await self._request_json("POST", "/user/repos", json=data)
+    
+    async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[Dict]:
+        """Get file content from repository"""
+        try:
+            status, data = await self._request("GET", f"/repos/{owner}/{repo}/contents/{path}")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        if status >= 400:
+            return None
+        return data
+    
+    async def create_or_update_file(self, owner: str, repo: str, path: str,
+                                    content: str, message: str, sha: str = None) -> Dict:
+        """Create or update a file in repository"""
+        data = {
+            "message": message,
+            "content": base64.b64encode(content.encode('utf-8')).decode('utf-8')
+        }
+        if sha:
+            data["sha"] = sha
+        return await self._request_json("PUT", f"/repos/{owner}/{repo}/contents/{path}", json=data)
+    
+    async def push_leetcode_solution(self, solution_data: Dict, repo_name: str = "leetcode-solutions") -> Dict:
+        """Push LeetCode solution to repository
+        
+        For many solutions to the same repository prefer GitHubClient.push_solutions_batch,
+        which writes them in one commit instead of racing on the branch head.
+        """
+        try:
+            user_info = await self.get_user_info()
+            username = user_info["login"]
+            
+            # The repository lookup and the file lookup are independent
+            filename, full_content = self._sync._build_solution_file(solution_data)
+            repo_status, existing_file = await asyncio.gather(
+                self._request("GET", f"/repos/{username}/{repo_name}"),
+                self.get_file_content(username, repo_name, filename)
+            )
+            if repo_status[0] == 404:
+                await self.create_repository(
+                    name=repo_name,
+                    description="My LeetCode solutions",
+                    private=False
+                )
+            
+            problem_title = solution_data.get("title", "Unknown Problem")
+            sha = existing_file["sha"] if existing_file else None
+            commit_message = f"Update solution: {problem_title}" if sha else f"Add solution: {problem_title}"
+            
+            result = await self.create_or_update_file(
+                owner=username,
+                repo=repo_name,
+                path=filename,
+                content=full_content,
+                message=commit_message,
+                sha=sha
+            )
+            
+            return {
+                "success": True,
+                "filename": filename,
+                "url": result["content"]["html_url"],
+                "message": f"Solution pushed successfully to {username}/{repo_name}"
+            }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def get_repository_stats(self, owner: str, repo: str) -> Dict:
+        """Get repository statistics, fetching repo, languages and commits concurrently"""
+        try:
+            repo_data, languages, commits = await asyncio.gather(
+                self._request_json("GET", f"/repos/{owner}/{repo}"),
+                self._request_json("GET", f"/repos/{owner}/{repo}/languages"),
+                self._request_json("GET", f"/repos/{owner}/{repo}/commits", params={"per_page": 10})
+            )
+            return self._sync._format_repository_stats(repo_data, languages, commits)
+        
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def get_repositories_stats(self, repositories: List[Tuple[str, str]]) -> List[Dict]:
+        """Get statistics for many (owner, repo) pairs concurrently, in input order"""
+        return await asyncio.gather(
+            *(self.get_repository_stats(owner, repo) for owner, repo in repositories)
+        )
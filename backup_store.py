@@ -0,0 +1,263 @@
+
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+_MANIFEST_TIME = re.compile(r"_(\d{8}_\d{6})(?:_(\d{6}))?\.json$")
+_MANIFEST_SUFFIX = re.compile(r"\d{8}_\d{6}(?:_\d{6})?\.json")
+
+
+class BackupStore:
+    """Incremental, content-addressed storage for GitHub repository backups
+    
+    Each repository record is stored once as a gzip-compressed chunk named by the
+    SHA-256 of its canonical JSON. A backup run writes a small manifest mapping
+    repository names to chunk hashes. Repositories whose updated_at/pushed_at
+    match the previous manifest reuse its chunk without being serialized again,
+    so nightly I/O is proportional to churn rather than account size.
+    
+    Layout:
+        backups/chunks/<hh>/<sha256>.json.gz
+        backups/manifests/manifest_<user>_<YYYYmmdd_HHMMSS_ffffff>.json
+    
+    A backup lists its chunks in a manifest only when it finishes, so prune()
+    leaves alone chunks written or reused within the last grace_period seconds,
+    along with in-progress .tmp files; chunks are touched whenever a backup
+    writes or reuses them.
+    """
+    
+    def __init__(self, backup_dir: str = "backups", grace_period: float = 86400):
+        self.backup_dir = backup_dir
+        self.grace_period = grace_period
+        self.chunks_dir = os.path.join(backup_dir, "chunks")
+        self.manifests_dir = os.path.join(backup_dir, "manifests")
+    
+    def create_backup(self, user: str, records: Iterable[Dict]) -> Dict:
+        """Write an incremental backup for a user and return the new manifest"""
+        previous = self.load_manifest(user=user)
+        previous_repos = previous["repositories"] if previous else {}
+        
+        repositories = {}
+        changed = 0
+        for record in records:
+            name = record["name"]
+            old_entry = previous_repos.get(name)
+            if (old_entry
+                    and old_entry.get("updated_at") == record.get("updated_at")
+                    and old_entry.get("pushed_at") == record.get("pushed_at")
+                    and self._touch_chunk(old_entry["chunk"])):
+                repositories[name] = old_entry
+                continue
+            
+            repositories[name] = {
+                "chunk": self.write_chunk(record),
+                "updated_at": record.get("updated_at"),
+                "pushed_at": record.get("pushed_at")
+            }
+            changed += 1
+        
+        timestamp = datetime.now()
+        manifest = {
+            "version": 1,
+            "timestamp": timestamp.isoformat(),
+            "user": user,
+            "base": previous["name"] if previous else None,
+            "total_repos": len(repositories),
+            "changed_repos": changed,
+            "removed_repos": len(set(previous_repos) - set(repositories)),
+            "repositories": repositories
+        }
+        
+        # Microseconds keep two backups for one user in the same second from overwriting each other
+        manifest["name"] = f"manifest_{user}_{timestamp.strftime('%Y%m%d_%H%M%S_%f')}.json"
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        self._write_atomic(os.path.join(self.manifests_dir, manifest["name"]),
+                           json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+        return manifest
+    
+    def write_chunk(self, record: Dict) -> str:
+        """Store a record as a compressed chunk and return its content hash"""
+        data = json.dumps(record, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        chunk_hash = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(chunk_hash)
+        if not self._touch_chunk(chunk_hash):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_atomic(path, gzip.compress(data, mtime=0))
+        return chunk_hash
+    
+    def read_chunk(self, chunk_hash: str) -> Dict:
+        """Load a record from its chunk"""
+        with gzip.open(self._chunk_path(chunk_hash), "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+    
+    def list_manifests(self, user: str = None) -> List[str]:
+        """List manifest names, oldest first, optionally for a single user"""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        
+        prefix = f"manifest_{user}_" if user else "manifest_"
+        names = [n for n in os.listdir(self.manifests_dir) if n.startswith(prefix) and _MANIFEST_TIME.search(n)]
+        if user:
+            # "manifest_bob_" is also the start of user bob_dev's manifests
+            names = [n for n in names if _MANIFEST_SUFFIX.fullmatch(n[len(prefix):])]
+        return sorted(names, key=self._manifest_sort_key)
+    
+    @staticmethod
+    def _manifest_sort_key(name: str) -> str:
+        """Sort on the timestamp suffix rather than the user part; older names lack microseconds"""
+        match = _MANIFEST_TIME.search(name)
+        return f"{match.group(1)}_{match.group(2) or '000000'}"
+    
+    def load_manifest(self, name: str = None, user: str = None) -> Optional[Dict]:
+        """Load a manifest by name, or the latest one (for a user) when no name is given"""
+        if name is None:
+            names = self.list_manifests(user)
+            if not names:
+                return None
+            name = names[-1]
+        
+        # A concurrent prune may remove the manifest between listing and opening it
+        try:
+            with open(os.path.join(self.manifests_dir, name), "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        manifest["name"] = name
+        return manifest
+    
+    def restore(self, name: str = None, user: str = None) -> Optional[Dict]:
+        """Rebuild a full backup snapshot, in the github_backup_*.json format, from a manifest"""
+        manifest = self.load_manifest(name, user)
+        if manifest is None:
+            return None
+        
+        return {
+            "timestamp": manifest["timestamp"],
+            "user": manifest["user"],
+            "total_repos": manifest["total_repos"],
+            "repositories": [self.read_chunk(entry["chunk"]) for entry in manifest["repositories"].values()]
+        }
+    
+    def prune(self, keep_last: int = 30, user: str = None) -> Dict:
+        """Keep the newest manifests per user and delete chunks no remaining manifest references
+        
+        Chunks touched within grace_period, which a running backup may be about to
+        list, and .tmp files are kept. With a user, only that user's old manifests
+        are removed; their chunks are left for the next full prune, which has to
+        read every manifest.
+        """
+        if user is not None:
+            return {"manifests_removed": self._remove_manifests(self.list_manifests(user), keep_last),
+                    "chunks_removed": 0}
+        
+        manifests_by_user = {}
+        for name in self.list_manifests():
+            manifest = self.load_manifest(name)
+            if manifest is not None:
+                manifests_by_user.setdefault(manifest["user"], []).append(manifest)
+        
+        manifests_removed = 0
+        referenced = set()
+        for manifests in manifests_by_user.values():
+            manifests_removed += self._remove_manifests([manifest["name"] for manifest in manifests], keep_last)
+            for manifest in manifests[max(len(manifests) - keep_last, 0):]:
+                referenced.update(entry["chunk"] for entry in manifest["repositories"].values())
+        
+        chunks_removed = 0
+        recent = time.time() - self.grace_period
+        if os.path.isdir(self.chunks_dir):
+            for shard in os.listdir(self.chunks_dir):
+                shard_dir = os.path.join(self.chunks_dir, shard)
+                for filename in os.listdir(shard_dir):
+                    if not filename.endswith(".json.gz") or filename[:-len(".json.gz")] in referenced:
+                        continue
+                    path = os.path.join(shard_dir, filename)
+                    try:
+                        if os.path.getmtime(path) > recent:
+                            continue
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    chunks_removed += 1
+        
+        return {"manifests_removed": manifests_removed, "chunks_removed": chunks_removed}
+    
+    def _remove_manifests(self, names: List[str], keep_last: int) -> int:
+        """Delete all but the newest keep_last of one user's manifests (oldest first) and return how many went"""
+        removed = 0
+        for name in names[:max(len(names) - keep_last, 0)]:
+            try:
+                os.remove(os.path.join(self.manifests_dir, name))
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+    
+    def _chunk_path(self, chunk_hash: str) -> str:
+        return os.path.join(self.chunks_dir, chunk_hash[:2], f"{chunk_hash}.json.gz")
+    
+    def _touch_chunk(self, chunk_hash: str) -> bool:
+        """Mark a chunk as in use now, so prune() leaves it alone; False if it does not exist"""
+        try:
+            os.utime(self._chunk_path(chunk_hash))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def _write_atomic(self, path: str, data: bytes):
+        """Write a file so readers never observe a partial write"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def main():
+    """Command-line entry point for listing, restoring and pruning backups"""
+    parser = argparse.ArgumentParser(description="Manage incremental GitHub backups")
+    parser.add_argument("--dir", default="backups", help="backup directory (default: backups)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    list_parser = subparsers.add_parser("list", help="list backup manifests")
+    list_parser.add_argument("--user", help="only show manifests for this GitHub user")
+    
+    restore_parser = subparsers.add_parser("restore", help="rebuild a full JSON snapshot from a manifest")
+    restore_parser.add_argument("--manifest", help="manifest name (default: latest)")
+    restore_parser.add_argument("--user", help="GitHub user whose latest manifest to restore")
+    restore_parser.add_argument("--output", help="write the snapshot here instead of stdout")
+    
+    prune_parser = subparsers.add_parser("prune", help="delete old manifests and unreferenced chunks")
+    prune_parser.add_argument("--keep", type=int, default=30, help="manifests to keep per user (default: 30)")
+    prune_parser.add_argument("--user", help="only remove this GitHub user's old manifests, leaving chunks")
+    prune_parser.add_argument("--grace", type=float, default=86400,
+                              help="keep unreferenced chunks touched within this many seconds (default: 86400)")
+    
+    args = parser.parse_args()
+    store = BackupStore(args.dir, grace_period=getattr(args, "grace", 86400))
+    
+    if args.command == "list":
+        for name in store.list_manifests(args.user):
+            print(name)
+    elif args.command == "restore":
+        snapshot = store.restore(args.manifest, args.user)
+        if snapshot is None:
+            parser.exit(1, "No matching backup manifest found\n")
+        output = json.dumps(snapshot, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output)
+        else:
+            print(output)
+    elif args.command == "prune":
+        print(json.dumps(store.prune(args.keep, args.user)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+
+
+"""Compare the memory held by dict-based and DayStats per-day statistics
+
+Usage: python benchmarks/bench_day_stats.py [--users 1000] [--days 90] [--solutions 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from day_stats import DayStats
+from stats_store import empty_daily_stats
+
+LANGUAGES = ["Python", "Java", "C++", "JavaScript", "Go", "Rust"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def generate_solutions(users: int, days: int, per_day: int):
+    """Yield (user_email, date, solution) in the shape record_push receives, as decoded from JSON"""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    for u in range(users):
+        user_email = f"user{u}@example.com"
+        for d in range(days):
+            day = start + timedelta(days=d)
+            for s in range(rng.randint(0, per_day * 2)):
+                problem = rng.randint(1, 3000)
+                yield user_email, day.strftime("%Y-%m-%d"), {
+                    "title": f"Problem {problem}",
+                    "difficulty": rng.choice(DIFFICULTIES),
+                    "language": rng.choice(LANGUAGES),
+                    "timestamp": (day + timedelta(seconds=rng.randint(0, 86399))).isoformat(),
+                    "url": f"https://leetcode.com/problems/problem-{problem}/"
+                }
+
+
+def build_dicts(solutions):
+    stats = {}
+    for user_email, date, solution in solutions:
+        daily_data = stats.setdefault(user_email, {}).get(date)
+        if daily_data is None:
+            daily_data = stats[user_email][date] = empty_daily_stats()
+        daily_data["problems_solved"] += 1
+        daily_data["total_pushes"] += 1
+        daily_data["languages_used"].add(solution["language"])
+        daily_data["difficulties"][solution["difficulty"]] += 1
+        # Copy the strings, as json.load would hand each solution its own
+        daily_data["solutions"].append({k: "".join(v) for k, v in solution.items()})
+    return stats
+
+
+def build_day_stats(solutions):
+    stats = {}
+    for user_email, date, solution in solutions:
+        day = stats.setdefault(user_email, {}).get(date)
+        if day is None:
+            day = stats[user_email][date] = DayStats()
+        day.add_solution({k: "".join(v) for k, v in solution.items()})
+    return stats
+
+
+def measure(builder, solutions):
+    tracemalloc.start()
+    stats = builder(solutions)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del stats
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--solutions", type=int, default=3, help="average solutions per day")
+    args = parser.parse_args()
+
+    solutions = list(generate_solutions(args.users, args.days, args.solutions))
+    dict_bytes = measure(build_dicts, solutions)
+    slots_bytes = measure(build_day_stats, solutions)
+
+    print(f"{args.users} users x {args.days} days, {len(solutions)} solutions")
+    print(f"dict records:     {dict_bytes / 1024 / 1024:8.1f} MiB")
+    print(f"DayStats records: {slots_bytes / 1024 / 1024:8.1f} MiB")
+    print(f"reduction:        {(1 - slots_bytes / dict_bytes) * 100:8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
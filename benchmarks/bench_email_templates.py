@@ -0,0 +1,105 @@
+
+
+"""Measure email render throughput with compiled templates against per-call parsing
+
+Usage: python benchmarks/bench_email_templates.py [--users 2000] [--rounds 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_templates import TEMPLATES, EmailTemplates, get_templates
+
+LANGUAGES = ["Python", "Java", "C++", "JavaScript", "Go", "Rust"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def generate_payloads(users: int):
+    """Daily summary, weekly report and reminder data for each user, shaped like the scheduler's"""
+    rng = random.Random(42)
+    payloads = {"daily_summary": {}, "weekly_report": {}, "problem_reminder": {}}
+    for u in range(users):
+        user_email = f"user{u}@example.com"
+        solutions = [
+            {"title": f"Problem {rng.randint(1, 3000)}", "difficulty": rng.choice(DIFFICULTIES),
+             "language": rng.choice(LANGUAGES)}
+            for _ in range(rng.randint(0, 6))
+        ]
+        difficulties = {d: sum(s["difficulty"] == d for s in solutions) for d in DIFFICULTIES}
+        languages = sorted({s["language"] for s in solutions})
+        payloads["daily_summary"][user_email] = {
+            "problems_solved": len(solutions), "difficulties": difficulties,
+            "languages_used": languages, "solutions": solutions
+        }
+        payloads["weekly_report"][user_email] = {
+            "start_date": "2024-01-01", "end_date": "2024-01-07", "total_problems": 7 * len(solutions),
+            "total_pushes": 8 * len(solutions), "difficulties": difficulties, "languages_used": languages,
+            "daily_breakdown": {f"2024-01-0{d}": rng.randint(0, 5) for d in range(1, 8)}
+        }
+        payloads["problem_reminder"][user_email] = {
+            "remaining_problems": rng.randint(0, 3), "solved_today": rng.randint(0, 3), "target_problems": 3,
+            "motivational_message": "Keep going!", "preferred_difficulty": rng.choice(DIFFICULTIES)
+        }
+    return payloads
+
+
+def render_parsing_each_call(payloads):
+    """Baseline: build the templates for every message, as a per-call implementation would"""
+    for kind, users in payloads.items():
+        for user_email, data in users.items():
+            EmailTemplates({kind: TEMPLATES[kind]}).render(kind, data)
+
+
+def render_compiled(payloads):
+    templates = get_templates()
+    for kind, users in payloads.items():
+        for user_email, data in users.items():
+            templates.render(kind, data)
+
+
+def render_batched(payloads):
+    templates = get_templates()
+    for kind, users in payloads.items():
+        templates.render_batch(kind, users.items())
+
+
+def measure(render, payloads, rounds: int) -> float:
+    """Best-of-rounds messages per second"""
+    messages = sum(len(users) for users in payloads.values())
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        render(payloads)
+        best = min(best, time.perf_counter() - started)
+    return messages / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    
+    payloads = generate_payloads(args.users)
+    # Compile the shared templates outside the timed runs, as happens at startup
+    get_templates()
+    
+    # Parsing per call is slow, so it gets a tenth of the users
+    sample = {kind: dict(list(users.items())[:max(1, args.users // 10)]) for kind, users in payloads.items()}
+    parsed = measure(render_parsing_each_call, sample, args.rounds)
+    compiled = measure(render_compiled, payloads, args.rounds)
+    batched = measure(render_batched, payloads, args.rounds)
+    
+    print(f"{args.users} users x {len(payloads)} message kinds")
+    print(f"parse per message:  {parsed:10.0f} msg/s")
+    print(f"compiled render:    {compiled:10.0f} msg/s  ({compiled / parsed:.0f}x)")
+    print(f"render_batch:       {batched:10.0f} msg/s  ({batched / parsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+    
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retrying in {retry_in:.0f}s)")
+        self.retry_in = retry_in
+
+
+class CircuitCall:
+    """One admitted call; its outcome is recorded at most once"""
+    
+    __slots__ = ("breaker", "settled")
+    
+    def __init__(self, breaker: "CircuitBreaker"):
+        self.breaker = breaker
+        self.settled = False
+    
+    def success(self):
+        if not self.settled:
+            self.settled = True
+            self.breaker.record_success()
+    
+    def failure(self, slow: bool = False):
+        if not self.settled:
+            self.settled = True
+            self.breaker.record_failure(slow)
+    
+    def release(self):
+        """End the call without a verdict, e.g. because the caller stopped waiting for it"""
+        if not self.settled:
+            self.settled = True
+            self.breaker.record_release()
+
+
+class CircuitBreaker:
+    """Fail fast while a backend keeps failing, and probe it before trusting it again
+    
+    Closed: calls go through; failure_threshold consecutive failures (errors or
+    calls slower than their SLO) open the circuit. Open: every call is rejected
+    immediately with CircuitOpenError for recovery_timeout seconds. Half-open:
+    up to half_open_max_calls probe calls are let through; a successful probe
+    closes the circuit and a failed one opens it again for another
+    recovery_timeout. A probe that reports nothing within recovery_timeout is
+    given up on and another one is admitted.
+    
+    Callers use attempt(), which asks before_call() for permission and makes
+    sure the outcome is recorded even if the call ends in an unexpected
+    exception. A call the caller abandons says nothing about the backend and
+    is released without a verdict.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        self._counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        now = time.monotonic()
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        elif (self._state == HALF_OPEN and self._probes >= self.half_open_max_calls
+              and now - self._probe_started >= self.recovery_timeout):
+            # The probes never reported back; try again rather than stay half-open forever
+            self._probes = 0
+        return self._state
+    
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_max_calls):
+                if state == HALF_OPEN:
+                    if self._probes == 0:
+                        self._probe_started = time.monotonic()
+                    self._probes += 1
+                self._counters["calls"] += 1
+                return
+            self._counters["rejected"] += 1
+            since = self._opened_at if state == OPEN else self._probe_started
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - since))
+        raise CircuitOpenError(self.name, retry_in)
+    
+    @contextmanager
+    def attempt(self) -> Iterator[CircuitCall]:
+        """Admit one call (or raise CircuitOpenError) and guarantee its outcome is recorded
+        
+        The body reports through the yielded CircuitCall. Leaving it without doing
+        so counts as a failure, except for GeneratorExit: a generator closed by its
+        consumer is released without a verdict.
+        """
+        self.before_call()
+        call = CircuitCall(self)
+        try:
+            yield call
+        except GeneratorExit:
+            call.release()
+            raise
+        finally:
+            call.failure()
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+    
+    def record_failure(self, slow: bool = False):
+        """Count a failed call; slow marks a call that succeeded but broke its latency SLO"""
+        with self._lock:
+            self._counters["slow_calls" if slow else "failures"] += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._counters["opened"] += 1
+    
+    def record_release(self):
+        """Forget an admitted call that ended without a verdict, freeing its half-open probe slot"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+    
+    def reset(self):
+        """Close the circuit and forget recent failures"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+    
+    def stats(self) -> Dict:
+        """Current state, consecutive failures and lifetime counters"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["state"] = self._current_state()
+            stats["consecutive_failures"] = self._failures
+        return stats
@@ -13,8 +13,73 @@ class Config:
     GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID')
     GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET')
     
+    # GitHub API client (connection pooling, retries and timeouts)
+    GITHUB_POOL_SIZE = int(os.getenv('GITHUB_POOL_SIZE', 10))
+    # Per-token sessions: at most this many are kept, and ones idle this many seconds are closed
+    GITHUB_MAX_TOKEN_POOLS = int(os.getenv('GITHUB_MAX_TOKEN_POOLS', 256))
+    GITHUB_POOL_IDLE_TIMEOUT = int(os.getenv('GITHUB_POOL_IDLE_TIMEOUT', 3600))
+    GITHUB_MAX_RETRIES = int(os.getenv('GITHUB_MAX_RETRIES', 3))
+    GITHUB_BACKOFF_FACTOR = float(os.getenv('GITHUB_BACKOFF_FACTOR', 0.5))
+    GITHUB_MAX_RETRY_WAIT = int(os.getenv('GITHUB_MAX_RETRY_WAIT', 60))
+    GITHUB_TIMEOUT = int(os.getenv('GITHUB_TIMEOUT', 30))
+    GITHUB_METADATA_TTL = int(os.getenv('GITHUB_METADATA_TTL', 300))
+    GITHUB_MAX_CONCURRENCY = int(os.getenv('GITHUB_MAX_CONCURRENCY', 10))
+    
+    # Incremental GitHub backups: manifests kept per user (0 disables automatic pruning)
+    BACKUP_KEEP_MANIFESTS = int(os.getenv('BACKUP_KEEP_MANIFESTS', 30))
+    # Server-local time of the nightly job that deletes backup chunks no manifest references
+    BACKUP_PRUNE_TIME = os.getenv('BACKUP_PRUNE_TIME', '04:00')
+    
+    # Statistics storage: 'sqlite:///path.db' selects SQLite, unset keeps JSON files under data/
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    
+    # Statistics write-ahead log: fsync batching and snapshot compaction interval (events)
+    STATS_FSYNC_INTERVAL = float(os.getenv('STATS_FSYNC_INTERVAL', 1.0))
+    STATS_FSYNC_BATCH = int(os.getenv('STATS_FSYNC_BATCH', 100))
+    STATS_COMPACT_EVERY = int(os.getenv('STATS_COMPACT_EVERY', 1000))
+    
+    # Scheduler: worker threads that run due jobs (emails, backups)
+    SCHEDULER_MAX_WORKERS = int(os.getenv('SCHEDULER_MAX_WORKERS', 4))
+    # Hours after a missed send time (e.g. during a restart) in which it is still sent; 0 disables
+    SCHEDULER_CATCHUP_HOURS = float(os.getenv('SCHEDULER_CATCHUP_HOURS', 6))
+    
     # AIML API (for AI features)
     AIML_API_KEY = os.getenv('AIML_API_KEY')
+    # Seconds a streamed completion may go without sending a chunk before it is abandoned
+    AIML_STREAM_TIMEOUT = float(os.getenv('AIML_STREAM_TIMEOUT', 30))
+    # AIML response cache: in-process LRU entries, seconds an answer stays valid, and the shared
+    # on-disk tier (empty path keeps the cache in memory only)
+    AIML_CACHE_ENABLED = os.getenv('AIML_CACHE_ENABLED', 'true').lower() == 'true'
+    AIML_CACHE_SIZE = int(os.getenv('AIML_CACHE_SIZE', 512))
+    AIML_CACHE_TTL = float(os.getenv('AIML_CACHE_TTL', 86400))
+    AIML_CACHE_PATH = os.getenv('AIML_CACHE_PATH', 'data/aiml_cache.db')
+    # AIMLClient methods never served from the cache (comma-separated), e.g. sampled, high-temperature ones
+    AIML_CACHE_EXCLUDE = [name.strip() for name in os.getenv('AIML_CACHE_EXCLUDE', 'generate_test_cases').split(',')
+                          if name.strip()]
+    # Share one in-flight request between concurrent identical AIML calls
+    AIML_COALESCE_REQUESTS = os.getenv('AIML_COALESCE_REQUESTS', 'true').lower() == 'true'
+    # AIML API quota, shared by every client in the process: requests in flight, requests and tokens
+    # per minute (0 disables a per-minute limit)
+    AIML_MAX_IN_FLIGHT = int(os.getenv('AIML_MAX_IN_FLIGHT', 4))
+    AIML_REQUESTS_PER_MINUTE = float(os.getenv('AIML_REQUESTS_PER_MINUTE', 60))
+    AIML_TOKENS_PER_MINUTE = float(os.getenv('AIML_TOKENS_PER_MINUTE', 100000))
+    # Token budgets for prompt inputs per AIMLClient method, e.g. "review_solution=4000,generate_test_cases=1500";
+    # methods not listed keep the defaults in aiml_prompts.PROMPT_BUDGETS
+    AIML_PROMPT_BUDGETS = {
+        name.strip(): int(budget)
+        for name, _, budget in (item.partition('=') for item in os.getenv('AIML_PROMPT_BUDGETS', '').split(','))
+        if name.strip() and budget.strip()
+    }
+    # Circuit breaker: consecutive failed or over-SLO calls that open it, and seconds before a probe call
+    AIML_BREAKER_FAILURES = int(os.getenv('AIML_BREAKER_FAILURES', 5))
+    AIML_BREAKER_RECOVERY = float(os.getenv('AIML_BREAKER_RECOVERY', 30))
+    # Latency SLOs (request timeouts) per method in seconds, e.g. "review_solution=20";
+    # methods not listed keep the defaults in aiml_client.METHOD_TIMEOUTS
+    AIML_METHOD_TIMEOUTS = {
+        name.strip(): float(seconds)
+        for name, _, seconds in (item.partition('=') for item in os.getenv('AIML_METHOD_TIMEOUTS', '').split(','))
+        if name.strip() and seconds.strip()
+    }
     
     # Email configuration (for notifications)
     EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
@@ -22,6 +87,18 @@ class Config:
     EMAIL_USER = os.getenv('EMAIL_USER')
     EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
     EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'true').lower() == 'true'
+    EMAIL_FROM = os.getenv('EMAIL_FROM')  # defaults to EMAIL_USER
+    # SMTP connection pool: connections kept open, seconds before an idle one is replaced, socket timeout
+    EMAIL_POOL_SIZE = int(os.getenv('EMAIL_POOL_SIZE', 4))
+    EMAIL_IDLE_TIMEOUT = float(os.getenv('EMAIL_IDLE_TIMEOUT', 60))
+    EMAIL_TIMEOUT = float(os.getenv('EMAIL_TIMEOUT', 30))
+    # Outbound email queue (data/email_queue.db): delivery workers, attempts before dead-lettering,
+    # retry backoff base and cap in seconds, and how long sent dedup keys are remembered
+    EMAIL_QUEUE_WORKERS = int(os.getenv('EMAIL_QUEUE_WORKERS', 2))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 6))
+    EMAIL_RETRY_BACKOFF = float(os.getenv('EMAIL_RETRY_BACKOFF', 30))
+    EMAIL_RETRY_MAX_BACKOFF = float(os.getenv('EMAIL_RETRY_MAX_BACKOFF', 3600))
+    EMAIL_QUEUE_RETENTION_DAYS = float(os.getenv('EMAIL_QUEUE_RETENTION_DAYS', 7))
     
     # Flask configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
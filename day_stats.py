@@ -0,0 +1,177 @@
+
+
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class CodeTable:
+    """Process-wide interning of repeated strings (languages, difficulties) to small ints"""
+    
+    def __init__(self, initial: List[str] = ()):
+        self._codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        for name in initial:
+            self.code(name)
+    
+    def code(self, name: str) -> int:
+        """Get the code for a string, assigning the next free one on first sight"""
+        code = self._codes.get(name)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(name)
+                if code is None:
+                    code = len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._codes[name] = code
+        return code
+    
+    def name(self, code: int) -> str:
+        """Get the string for a code"""
+        return self._names[code]
+
+
+LANGUAGES = CodeTable()
+DIFFICULTIES = CodeTable(["Easy", "Medium", "Hard", "Unknown"])
+EASY, MEDIUM, HARD = DIFFICULTIES.code("Easy"), DIFFICULTIES.code("Medium"), DIFFICULTIES.code("Hard")
+_DIFFICULTY_NAMES = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
+
+# Stands in for a solution recorded without a timestamp (older records)
+NO_TIMESTAMP = -(1 << 63)
+
+
+def normalize_difficulty(difficulty: str) -> str:
+    """Map client-supplied difficulty text onto Easy, Medium, Hard or Unknown
+    
+    Difficulty arrives as free text, and codes are stored in a byte array, so
+    only this fixed set is ever interned.
+    """
+    return _DIFFICULTY_NAMES.get(str(difficulty or "").strip().lower(), "Unknown")
+
+
+def timestamp_to_int(timestamp: str) -> int:
+    """Encode an ISO timestamp as microseconds since 1970-01-01 (naive, so local times round-trip exactly)"""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def int_to_timestamp(value: int) -> str:
+    """Decode a timestamp_to_int value back into the same ISO string"""
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+class DayStats:
+    """Compact statistics for one user on one day
+    
+    Replaces the per-day dict (with its set, nested difficulties dict and list of
+    solution dicts) by plain counters, a language bitmask over interned language
+    codes, and column-oriented solution storage: parallel title/url lists plus
+    array-backed difficulty codes, language codes and epoch-microsecond timestamps.
+    Convert with to_dict()/from_dict() at JSON and SQLite boundaries.
+    """
+    
+    __slots__ = (
+        "problems_solved", "total_pushes", "easy", "medium", "hard", "languages_mask",
+        "titles", "urls", "difficulty_codes", "language_codes", "timestamps"
+    )
+    
+    def __init__(self):
+        self.problems_solved = 0
+        self.total_pushes = 0
+        self.easy = 0
+        self.medium = 0
+        self.hard = 0
+        self.languages_mask = 0
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.difficulty_codes = array("B")
+        self.language_codes = array("H")
+        self.timestamps = array("q")
+    
+    def add_solution(self, solution: Dict):
+        """Count a pushed solution"""
+        self.problems_solved += 1
+        self.total_pushes += 1
+        
+        difficulty = DIFFICULTIES.code(normalize_difficulty(solution["difficulty"]))
+        if difficulty == EASY:
+            self.easy += 1
+        elif difficulty == MEDIUM:
+            self.medium += 1
+        elif difficulty == HARD:
+            self.hard += 1
+        
+        language = LANGUAGES.code(solution["language"])
+        self.languages_mask |= 1 << language
+        self._append_solution(solution, difficulty, language)
+    
+    def _append_solution(self, solution: Dict, difficulty: int, language: int):
+        self.titles.append(sys.intern(solution.get("title") or ""))
+        self.urls.append(sys.intern(solution.get("url") or ""))
+        self.difficulty_codes.append(difficulty)
+        self.language_codes.append(language)
+        timestamp = solution.get("timestamp")
+        self.timestamps.append(timestamp_to_int(timestamp) if timestamp else NO_TIMESTAMP)
+    
+    @property
+    def languages_used(self) -> set:
+        mask = self.languages_mask
+        languages = set()
+        code = 0
+        while mask:
+            if mask & 1:
+                languages.add(LANGUAGES.name(code))
+            mask >>= 1
+            code += 1
+        return languages
+    
+    def to_dict(self) -> Dict:
+        """Expand into the daily_stats dict shape"""
+        return {
+            "problems_solved": self.problems_solved,
+            "total_pushes": self.total_pushes,
+            "languages_used": self.languages_used,
+            "difficulties": {"Easy": self.easy, "Medium": self.medium, "Hard": self.hard},
+            "solutions": [self._solution_dict(i) for i in range(len(self.titles))]
+        }
+    
+    def _solution_dict(self, i: int) -> Dict:
+        solution = {
+            "title": self.titles[i],
+            "difficulty": DIFFICULTIES.name(self.difficulty_codes[i]),
+            "language": LANGUAGES.name(self.language_codes[i])
+        }
+        if self.timestamps[i] != NO_TIMESTAMP:
+            solution["timestamp"] = int_to_timestamp(self.timestamps[i])
+        solution["url"] = self.urls[i]
+        return solution
+    
+    @classmethod
+    def from_dict(cls, daily_data: Dict) -> "DayStats":
+        """Build from the daily_stats dict shape"""
+        day = cls()
+        day.problems_solved = daily_data.get("problems_solved", 0)
+        day.total_pushes = daily_data.get("total_pushes", 0)
+        difficulties = daily_data.get("difficulties", {})
+        day.easy = difficulties.get("Easy", 0)
+        day.medium = difficulties.get("Medium", 0)
+        day.hard = difficulties.get("Hard", 0)
+        
+        for language in daily_data.get("languages_used", ()):
+            day.languages_mask |= 1 << LANGUAGES.code(language)
+        
+        for solution in daily_data.get("solutions", ()):
+            day._append_solution(
+                solution,
+                DIFFICULTIES.code(normalize_difficulty(solution.get("difficulty"))),
+                LANGUAGES.code(solution.get("language") or "unknown")
+            )
+        return day
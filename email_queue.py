@@ -0,0 +1,374 @@
+
+
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+from config import Config
+from email_client import EmailClient
+
+
+class EmailQueue:
+    """Durable outbound email queue backed by SQLite
+    
+    enqueue() only inserts rows into the outbox table, so callers never wait on
+    SMTP. Worker threads claim due rows in batches, send them through the
+    EmailClient connection pool, and then either mark them sent or reschedule them
+    with exponential backoff and jitter. Messages that fail max_attempts times, or
+    are rejected permanently, move to the dead_letters table.
+    
+    Each message may carry a dedup_key (e.g. "daily_summary:user@example.com:2024-05-01");
+    a key already queued or sent within the retention period is not queued again.
+    Claimed rows are leased, so rows held by a crashed process are retried once the
+    lease expires. A worker renews its lease between sending rounds and only sends,
+    or records the outcome of, rows whose lease it still holds.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY,
+            dedup_key TEXT UNIQUE,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            html TEXT,
+            text TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL,
+            leased_until REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            sent_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt);
+        CREATE TABLE IF NOT EXISTS dead_letters (
+            id INTEGER PRIMARY KEY,
+            dedup_key TEXT,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            html TEXT,
+            text TEXT,
+            attempts INTEGER NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            failed_at REAL NOT NULL
+        );
+    """
+    
+    # Seconds a claimed message stays invisible to other workers after each claim or renewal
+    LEASE_SECONDS = 300
+    
+    def __init__(self, db_path: str = "data/email_queue.db", email_client: EmailClient = None,
+                 workers: int = None, max_attempts: int = None, backoff: float = None,
+                 max_backoff: float = None, batch_size: int = 50, retention_days: float = None):
+        self.db_path = db_path
+        self.email_client = email_client or EmailClient()
+        self.workers = workers or Config.EMAIL_QUEUE_WORKERS
+        self.max_attempts = max_attempts or Config.EMAIL_MAX_ATTEMPTS
+        self.backoff = Config.EMAIL_RETRY_BACKOFF if backoff is None else backoff
+        self.max_backoff = Config.EMAIL_RETRY_MAX_BACKOFF if max_backoff is None else max_backoff
+        self.batch_size = batch_size
+        self.retention_days = Config.EMAIL_QUEUE_RETENTION_DAYS if retention_days is None else retention_days
+        
+        self._local = threading.local()
+        self._claim_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        # Set by enqueue so a worker between its last claim and its wait does not oversleep
+        self._signalled = False
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._last_purge = 0.0
+        self.logger = logging.getLogger(__name__)
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(self.SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def enqueue(self, to: str, subject: str, html: str = None, text: str = None,
+                dedup_key: str = None) -> bool:
+        """Queue one email; returns False if its dedup_key was already queued"""
+        return self.enqueue_batch([{"to": to, "subject": subject, "html": html, "text": text,
+                                    "dedup_key": dedup_key}])[0]
+    
+    def enqueue_batch(self, messages: List[Dict]) -> List[bool]:
+        """Queue many emails in one transaction
+        
+        Each message is a dict with to, subject, html and/or text, and an optional
+        dedup_key. Returns, per message, whether it was queued (False for duplicates).
+        """
+        now = time.time()
+        conn = self._connect()
+        queued = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for message in messages:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO outbox (dedup_key, recipient, subject, html, text, next_attempt, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (message.get("dedup_key"), message["to"], message["subject"],
+                     message.get("html"), message.get("text"), now, now)
+                )
+                queued.append(cursor.rowcount == 1)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        if any(queued):
+            self._notify()
+        return queued
+    
+    def _notify(self):
+        with self._wakeup:
+            self._signalled = True
+            self._wakeup.notify_all()
+    
+    def start(self):
+        """Start the delivery workers"""
+        with self._wakeup:
+            if self._running:
+                return
+            self._running = True
+        self._threads = [
+            threading.Thread(target=self._run_worker, name=f"email-queue-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self, timeout: float = 10):
+        """Stop the workers after their current batch; undelivered mail stays queued"""
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+    
+    def _run_worker(self):
+        while self._running:
+            try:
+                batch = self._claim_batch()
+                if batch:
+                    self._deliver(batch)
+                    continue
+                self._purge_sent()
+                delay = self._seconds_until_next_due()
+            except Exception as e:
+                self.logger.error(f"Email queue worker error: {str(e)}")
+                delay = 5
+            
+            with self._wakeup:
+                if self._running and not self._signalled:
+                    self._wakeup.wait(delay)
+                self._signalled = False
+    
+    def _claim_batch(self) -> List[Dict]:
+        """Lease up to batch_size due messages to this worker"""
+        now = time.time()
+        lease = now + self.LEASE_SECONDS
+        conn = self._connect()
+        with self._claim_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, recipient, subject, html, text, attempts, dedup_key, created_at FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt <= ? AND (leased_until IS NULL OR leased_until < ?) "
+                    "ORDER BY next_attempt LIMIT ?",
+                    (now, now, self.batch_size)
+                ).fetchall()
+                conn.executemany("UPDATE outbox SET leased_until = ? WHERE id = ?", [(lease, row[0]) for row in rows])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        
+        # leased_until doubles as the lease token: a reclaim or renewal always changes it
+        return [
+            {"id": row[0], "to": row[1], "subject": row[2], "html": row[3], "text": row[4],
+             "attempts": row[5], "dedup_key": row[6], "created_at": row[7], "leased_until": lease}
+            for row in rows
+        ]
+    
+    def _deliver(self, batch: List[Dict]):
+        """Send a claimed batch in rounds of one message per pooled connection
+        
+        A slow SMTP server (EMAIL_TIMEOUT plus a reconnect per message) could otherwise
+        outlast the lease on the end of the batch and let another worker send it too.
+        """
+        round_size = max(self.email_client.pool_size, 1)
+        pending = batch
+        while pending:
+            if pending is not batch:
+                pending = self._renew_leases(pending)
+            current, pending = pending[:round_size], pending[round_size:]
+            if current:
+                self._record_results(current, self.email_client.send_batch(current))
+    
+    def _renew_leases(self, messages: List[Dict]) -> List[Dict]:
+        """Extend the lease on messages this worker still holds and return those messages"""
+        lease = time.time() + self.LEASE_SECONDS
+        held = []
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for message in messages:
+                cursor = conn.execute(
+                    "UPDATE outbox SET leased_until = ? WHERE id = ? AND status = 'pending' AND leased_until = ?",
+                    (lease, message["id"], message["leased_until"])
+                )
+                if cursor.rowcount == 1:
+                    held.append(dict(message, leased_until=lease))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        if len(held) < len(messages):
+            self.logger.warning(f"Email queue: lease lost on {len(messages) - len(held)} messages; not sending them")
+        return held
+    
+    def _record_results(self, messages: List[Dict], results: List[Dict]):
+        """Mark sent messages, reschedule or dead-letter failed ones, for rows still leased to this worker"""
+        now = time.time()
+        sent, retries, dead, lost = 0, 0, 0, 0
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for message, result in zip(messages, results):
+                owned = (message["id"], message["leased_until"])
+                attempts = message["attempts"] + 1
+                if result["success"]:
+                    cursor = conn.execute(
+                        "UPDATE outbox SET status = 'sent', sent_at = ?, leased_until = NULL, html = NULL, text = NULL "
+                        "WHERE id = ? AND leased_until = ?",
+                        (now,) + owned
+                    )
+                    sent += cursor.rowcount
+                elif result.get("permanent") or attempts >= self.max_attempts:
+                    # Dead messages keep a 'dead' outbox row so their dedup_key is still honoured
+                    cursor = conn.execute(
+                        "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, leased_until = NULL, "
+                        "html = NULL, text = NULL, sent_at = ? WHERE id = ? AND leased_until = ?",
+                        (attempts, result.get("error"), now) + owned
+                    )
+                    if cursor.rowcount:
+                        conn.execute(
+                            "INSERT INTO dead_letters (dedup_key, recipient, subject, html, text, attempts, "
+                            "last_error, created_at, failed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (message["dedup_key"], message["to"], message["subject"], message["html"],
+                             message["text"], attempts, result.get("error"), message["created_at"], now)
+                        )
+                    dead += cursor.rowcount
+                else:
+                    cursor = conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ?, leased_until = NULL "
+                        "WHERE id = ? AND leased_until = ?",
+                        (attempts, now + self._backoff_delay(attempts), result.get("error")) + owned
+                    )
+                    retries += cursor.rowcount
+                lost += 1 - cursor.rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        if retries or dead or lost:
+            self.logger.warning(f"Email queue: {sent} sent, {retries} to retry, {dead} dead-lettered, "
+                                f"{lost} no longer leased to this worker")
+    
+    def _backoff_delay(self, attempts: int) -> float:
+        """Exponential backoff with full jitter, capped at max_backoff"""
+        return random.uniform(0.5, 1.0) * min(self.max_backoff, self.backoff * (2 ** (attempts - 1)))
+    
+    def _seconds_until_next_due(self) -> float:
+        row = self._connect().execute(
+            "SELECT MIN(MAX(next_attempt, COALESCE(leased_until, 0))) FROM outbox WHERE status = 'pending'"
+        ).fetchone()
+        if row[0] is None:
+            return 60
+        return min(max(row[0] - time.time(), 0.05), 60)
+    
+    def _purge_sent(self):
+        """Drop delivered rows (and their dedup keys) older than the retention period, hourly"""
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        conn = self._connect()
+        conn.execute("DELETE FROM outbox WHERE status IN ('sent', 'dead') AND sent_at < ?",
+                     (now - self.retention_days * 86400,))
+    
+    def stats(self) -> Dict:
+        """Counts of pending, sent and dead-lettered messages"""
+        conn = self._connect()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        return {
+            "pending": counts.get("pending", 0),
+            "sent": counts.get("sent", 0),
+            "dead_letters": conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+        }
+    
+    def dead_letters(self, limit: int = 100) -> List[Dict]:
+        """Most recent dead-lettered messages"""
+        rows = self._connect().execute(
+            "SELECT id, dedup_key, recipient, subject, attempts, last_error, failed_at FROM dead_letters "
+            "ORDER BY failed_at DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [
+            {"id": row[0], "dedup_key": row[1], "to": row[2], "subject": row[3], "attempts": row[4],
+             "error": row[5], "failed_at": row[6]}
+            for row in rows
+        ]
+    
+    def requeue_dead_letter(self, dead_letter_id: int) -> bool:
+        """Move a dead-lettered message back into the outbox for another round of attempts"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT dedup_key, recipient, subject, html, text, created_at FROM dead_letters WHERE id = ?",
+                (dead_letter_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return False
+            dedup_key, recipient, subject, html, text, created_at = row
+            if dedup_key is not None:
+                conn.execute("DELETE FROM outbox WHERE dedup_key = ?", (dedup_key,))
+            conn.execute(
+                "INSERT INTO outbox (dedup_key, recipient, subject, html, text, next_attempt, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (dedup_key, recipient, subject, html, text, time.time(), created_at)
+            )
+            conn.execute("DELETE FROM dead_letters WHERE id = ?", (dead_letter_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        self._notify()
+        return True
+    
+    def close(self):
+        """Stop the workers and close this thread's connection"""
+        self.stop()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
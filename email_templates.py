@@ -0,0 +1,142 @@
+
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from jinja2 import ChainableUndefined, Environment, Template
+
+# Subject, HTML body and plain-text body per notification kind. Missing keys in the
+# data dict render as their defaults, so partial dicts never raise.
+TEMPLATES = {
+    "daily_summary": {
+        "subject": "Your LeetCode Daily Summary - {{ problems_solved|default(0) }} solved",
+        "html": """\
+{% set languages = languages_used|default([])|sort|join(", ") or "None" %}
+<h2>📊 Your LeetCode Daily Summary</h2>
+<p>Problems solved today: <b>{{ problems_solved|default(0) }}</b></p>
+<p>Easy: {{ difficulties.Easy|default(0) }} · Medium: {{ difficulties.Medium|default(0) }} · Hard: {{ difficulties.Hard|default(0) }}</p>
+<p>Languages: {{ languages }}</p>
+{% if solutions %}
+<ul>
+{% for s in solutions %}
+<li>{{ s.title|default("Unknown") }} ({{ s.difficulty|default("Unknown") }}, {{ s.language|default("unknown") }})</li>
+{% endfor %}
+</ul>
+{% else %}
+<p>No solutions pushed today.</p>
+{% endif %}
+""",
+        "text": """\
+{% set languages = languages_used|default([])|sort|join(", ") or "None" %}
+Problems solved today: {{ problems_solved|default(0) }}
+Easy: {{ difficulties.Easy|default(0) }}, Medium: {{ difficulties.Medium|default(0) }}, Hard: {{ difficulties.Hard|default(0) }}
+Languages: {{ languages }}
+{% for s in solutions|default([]) %}
+- {{ s.title|default("Unknown") }} ({{ s.difficulty|default("Unknown") }})
+{% endfor %}
+"""
+    },
+    "weekly_report": {
+        "subject": "Your Weekly LeetCode Report - {{ total_problems|default(0) }} solved",
+        "html": """\
+{% set languages = languages_used|default([])|sort|join(", ") or "None" %}
+<h2>📈 Your Weekly LeetCode Report</h2>
+<p>{{ start_date|default("") }} to {{ end_date|default("") }}</p>
+<p>Problems solved: <b>{{ total_problems|default(0) }}</b> ({{ total_pushes|default(0) }} pushes)</p>
+<p>Easy: {{ difficulties.Easy|default(0) }} · Medium: {{ difficulties.Medium|default(0) }} · Hard: {{ difficulties.Hard|default(0) }}</p>
+<p>Languages: {{ languages }}</p>
+{% if daily_breakdown %}
+<table><tr><th>Date</th><th>Solved</th></tr>
+{% for date, count in daily_breakdown|dictsort %}
+<tr><td>{{ date }}</td><td>{{ count }}</td></tr>
+{% endfor %}
+</table>
+{% endif %}
+""",
+        "text": """\
+{% set languages = languages_used|default([])|sort|join(", ") or "None" %}
+{{ start_date|default("") }} to {{ end_date|default("") }}
+Problems solved: {{ total_problems|default(0) }} ({{ total_pushes|default(0) }} pushes)
+Easy: {{ difficulties.Easy|default(0) }}, Medium: {{ difficulties.Medium|default(0) }}, Hard: {{ difficulties.Hard|default(0) }}
+Languages: {{ languages }}
+{% for date, count in daily_breakdown|default({})|dictsort %}
+{{ date }}: {{ count }}
+{% endfor %}
+"""
+    },
+    "problem_reminder": {
+        "subject": """\
+{% set remaining = remaining_problems|default(0) %}
+{% if remaining == 0 %}
+LeetCode Reminder - daily target reached!
+{%- else %}
+LeetCode Reminder - {{ remaining }} problem{{ "s" if remaining != 1 }} to go
+{%- endif %}""",
+        "html": """\
+<h2>⏰ LeetCode Reminder</h2>
+<p>{{ motivational_message|default("") }}</p>
+<p>Solved today: <b>{{ solved_today|default(0) }}</b> of {{ target_problems|default(1) }}</p>
+<p>Suggested difficulty: {{ preferred_difficulty|default("Medium") }}</p>
+""",
+        "text": """\
+{{ motivational_message|default("") }}
+Solved today: {{ solved_today|default(0) }} of {{ target_problems|default(1) }}
+Suggested difficulty: {{ preferred_difficulty|default("Medium") }}
+"""
+    }
+}
+
+
+class EmailTemplates:
+    """Compiled subject, HTML and plain-text templates for every notification kind
+    
+    All templates are parsed and compiled to Python code once, when the instance is
+    created, so rendering a message is a single call into the compiled template.
+    HTML bodies are autoescaped; subjects and plain-text bodies are not.
+    """
+    
+    def __init__(self, templates: Dict[str, Dict[str, str]] = None):
+        options = {"trim_blocks": True, "lstrip_blocks": True, "keep_trailing_newline": True,
+                   "undefined": ChainableUndefined}
+        html_env = Environment(autoescape=True, **options)
+        text_env = Environment(autoescape=False, **options)
+        
+        self._compiled: Dict[str, Tuple[Template, Template, Template]] = {}
+        for kind, sources in (templates or TEMPLATES).items():
+            self._compiled[kind] = (
+                text_env.from_string(sources["subject"]),
+                html_env.from_string(sources["html"]),
+                text_env.from_string(sources["text"])
+            )
+    
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._compiled)
+    
+    def _get(self, kind: str) -> Tuple[Template, Template, Template]:
+        try:
+            return self._compiled[kind]
+        except KeyError:
+            raise ValueError(f"Unknown notification kind: {kind}") from None
+    
+    def render(self, kind: str, data: Dict) -> Dict:
+        """Render one message as a dict with subject, html and text"""
+        subject, html, text = self._get(kind)
+        return {"subject": subject.render(data).strip(), "html": html.render(data), "text": text.render(data)}
+    
+    def render_batch(self, kind: str, payloads: Iterable[Tuple[str, Dict]]) -> List[Dict]:
+        """Render one kind of message for many users
+        
+        payloads is an iterable of (recipient, data) pairs, e.g. dict.items(). Returns
+        message dicts with to, subject, html and text, in the same order.
+        """
+        subject, html, text = self._get(kind)
+        return [
+            {"to": to, "subject": subject.render(data).strip(), "html": html.render(data), "text": text.render(data)}
+            for to, data in payloads
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_templates() -> EmailTemplates:
+    """The shared, compiled-once default templates"""
+    return EmailTemplates()
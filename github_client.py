@@ -1,38 +1,296 @@
 
+import asyncio
 import requests
 import base64
+import hashlib
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from config import Config
 
+# HTTP methods that are safe to replay after a 5xx or a dropped connection
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "PATCH", "DELETE"}
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+RATE_LIMIT_STATUS_CODES = {403, 429}
+
+
+class _TokenPool:
+    """Keep-alive session and rate-limit state shared by all clients of one token"""
+    
+    def __init__(self, access_token: str, pool_size: int):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        })
+        self.rate_limit = {"limit": None, "remaining": None, "reset": None, "used": None}
+        # API path -> {"data", "etag", "fetched_at"}; revalidated with If-None-Match after the TTL
+        self.metadata = {}
+        # (owner, repo) -> {path: blob sha} for repositories this token pushes to
+        self.file_shas = {}
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+    
+    def close(self):
+        self.session.close()
+
+
+# Keyed by a hash of the token so the secret itself is not kept as a dict key;
+# least recently used first
+_token_pools: "OrderedDict[str, _TokenPool]" = OrderedDict()
+_token_pools_lock = threading.Lock()
+
+
+def _get_token_pool(access_token: str, pool_size: int) -> _TokenPool:
+    """Return the process-wide pool for a token, creating it on first use
+    
+    Pools idle for longer than GITHUB_POOL_IDLE_TIMEOUT (e.g. for revoked or
+    logged-out tokens) are closed, and at most GITHUB_MAX_TOKEN_POOLS are kept.
+    """
+    key = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    now = time.monotonic()
+    with _token_pools_lock:
+        pool = _token_pools.get(key)
+        if pool is None:
+            pool = _TokenPool(access_token, pool_size)
+            _token_pools[key] = pool
+        pool.last_used = now
+        _token_pools.move_to_end(key)
+        
+        # Clients still holding an evicted pool keep working; its session just reconnects
+        for stale_key in [k for k, p in _token_pools.items() if now - p.last_used > Config.GITHUB_POOL_IDLE_TIMEOUT]:
+            _token_pools.pop(stale_key).close()
+        while len(_token_pools) > Config.GITHUB_MAX_TOKEN_POOLS:
+            _token_pools.popitem(last=False)[1].close()
+        return pool
+
+
+@lru_cache(maxsize=None)
+def _get_stats_executor() -> ThreadPoolExecutor:
+    """Shared workers for fanning out the requests behind one repository's statistics"""
+    return ThreadPoolExecutor(max_workers=Config.GITHUB_POOL_SIZE, thread_name_prefix="github-stats")
+
+
 class GitHubClient:
     """GitHub API client for repository operations"""
     
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, pool_size: int = None, max_retries: int = None,
+                 backoff_factor: float = None, timeout: int = None):
         self.access_token = access_token
         self.base_url = "https://api.github.com"
-        self.headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        self.max_retries = Config.GITHUB_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = Config.GITHUB_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.max_retry_wait = Config.GITHUB_MAX_RETRY_WAIT
+        self.timeout = Config.GITHUB_TIMEOUT if timeout is None else timeout
+        self.metadata_ttl = Config.GITHUB_METADATA_TTL
+        
+        # Clients created for the same token share one keep-alive connection pool
+        self._pool = _get_token_pool(access_token, pool_size or Config.GITHUB_POOL_SIZE)
+        self.session = self._pool.session
+        self.headers = dict(self.session.headers)
+    
+    def _request(self, method: str, path: str, idempotent: bool = None, **kwargs) -> requests.Response:
+        """Send a request through the pooled session, retrying 5xx and rate-limit responses
+        
+        Pass idempotent=True for POSTs that are safe to replay, such as creating
+        content-addressed git blobs and trees.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        self._pool.last_used = time.monotonic()
+        
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            self._update_rate_limit(response.headers)
+            
+            status = response.status_code
+            body = response.text if status in RATE_LIMIT_STATUS_CODES else ""
+            delay = self._retry_delay(idempotent, status, response.headers, body, attempt)
+            if delay is None:
+                return response
+            
+            time.sleep(delay)
+            attempt += 1
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff delay for the given retry attempt"""
+        return min(self.backoff_factor * (2 ** attempt), self.max_retry_wait)
+    
+    def _retry_delay(self, idempotent: bool, status: int, headers, body: str, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None if it should not be retried"""
+        if attempt >= self.max_retries:
+            return None
+        
+        if status in RETRY_STATUS_CODES:
+            return self._backoff_delay(attempt) if idempotent else None
+        
+        if status not in RATE_LIMIT_STATUS_CODES:
+            return None
+        
+        # Rate-limited requests were rejected before being applied, so every method may retry
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            reset = int(headers.get("X-RateLimit-Reset", 0))
+            delay = max(0.0, reset - time.time()) + 1
+        elif "secondary rate limit" in body.lower():
+            delay = self._backoff_delay(attempt) * 10
+        else:
+            # Plain 403: permission problem, not throttling
+            return None
+        
+        return delay if delay <= self.max_retry_wait else None
+    
+    def _update_rate_limit(self, headers):
+        """Record X-RateLimit-* headers so callers can throttle before being rejected"""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        
+        with self._pool.lock:
+            rate_limit = self._pool.rate_limit
+            for key in ("limit", "remaining", "reset", "used"):
+                value = headers.get(f"X-RateLimit-{key.capitalize()}")
+                if value is not None and value.isdigit():
+                    rate_limit[key] = int(value)
+    
+    def get_rate_limit(self) -> Dict:
+        """Get the last seen rate-limit state for this token"""
+        with self._pool.lock:
+            return dict(self._pool.rate_limit)
+    
+    def wait_for_rate_limit(self, min_remaining: int = 10, max_wait: float = None) -> float:
+        """Sleep until the rate-limit window resets if fewer than min_remaining requests are left
+        
+        Returns the number of seconds waited.
+        """
+        rate_limit = self.get_rate_limit()
+        remaining = rate_limit["remaining"]
+        reset = rate_limit["reset"]
+        if remaining is None or reset is None or remaining >= min_remaining:
+            return 0.0
+        
+        delay = max(0.0, reset - time.time())
+        if max_wait is not None:
+            delay = min(delay, max_wait)
+        time.sleep(delay)
+        return delay
+    
+    def _cached_get(self, path: str) -> Optional[Dict]:
+        """GET a rarely-changing resource through the per-token metadata cache
+        
+        Fresh entries are served without a request. Stale entries are revalidated
+        with If-None-Match, and a 304 reply does not count against the rate limit.
+        Returns None on 404.
+        """
+        with self._pool.lock:
+            entry = self._pool.metadata.get(path)
+        
+        now = time.time()
+        if entry and now - entry["fetched_at"] < self.metadata_ttl:
+            return entry["data"]
+        
+        headers = {"If-None-Match": entry["etag"]} if entry and entry["etag"] else {}
+        response = self._request("GET", path, headers=headers)
+        
+        if response.status_code == 304 and entry:
+            with self._pool.lock:
+                entry["fetched_at"] = now
+            return entry["data"]
+        
+        if response.status_code == 404:
+            self._invalidate_metadata(path)
+            return None
+        
+        response.raise_for_status()
+        data = response.json()
+        self._store_metadata(path, data, response.headers.get("ETag"))
+        return data
+    
+    def _store_metadata(self, path: str, data: Dict, etag: str = None):
+        """Put a resource into the per-token metadata cache"""
+        with self._pool.lock:
+            self._pool.metadata[path] = {"data": data, "etag": etag, "fetched_at": time.time()}
+    
+    def _invalidate_metadata(self, path: str):
+        """Drop a resource from the per-token metadata cache"""
+        with self._pool.lock:
+            self._pool.metadata.pop(path, None)
+    
+    def clear_metadata_cache(self):
+        """Forget cached user, repository and file SHA metadata for this token"""
+        with self._pool.lock:
+            self._pool.metadata.clear()
+            self._pool.file_shas.clear()
     
     def get_user_info(self) -> Dict:
         """Get authenticated user information"""
-        response = requests.get(f"{self.base_url}/user", headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        user_info = self._cached_get("/user")
+        if user_info is None:
+            raise requests.HTTPError("Authenticated user not found")
+        return user_info
     
     def list_repositories(self, per_page: int = 30) -> List[Dict]:
         """List user's repositories"""
-        response = requests.get(
-            f"{self.base_url}/user/repos",
-            headers=self.headers,
+        response = self._request(
+            "GET",
+            "/user/repos",
             params={"per_page": per_page, "sort": "updated"}
         )
         response.raise_for_status()
         return response.json()
     
+    def iter_repositories(self, per_page: int = 100, sort: str = "full_name",
+                          prefetch: bool = True) -> Iterator[Dict]:
+        """Iterate over all of the user's repositories, following Link rel="next" pagination
+        
+        Repositories are yielded as each page arrives. With prefetch enabled the next
+        page is requested in the background while the caller works through the current
+        one. The default sort is stable, so repositories updated mid-walk are neither
+        skipped nor repeated.
+        """
+        def fetch_page(url: str, params: Optional[Dict]) -> Tuple[List[Dict], Optional[str]]:
+            response = self._request("GET", url, params=params)
+            response.raise_for_status()
+            return response.json(), response.links.get("next", {}).get("url")
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page, next_url = fetch_page("/user/repos", {"per_page": min(per_page, 100), "sort": sort})
+            while True:
+                pending = executor.submit(fetch_page, next_url, None) if executor and next_url else None
+                
+                for repo in page:
+                    yield repo
+                
+                if not next_url:
+                    return
+                page, next_url = pending.result() if pending else fetch_page(next_url, None)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
     def create_repository(self, name: str, description: str = "", private: bool = False) -> Dict:
         """Create a new repository"""
         data = {
@@ -42,9 +300,9 @@ class GitHubClient:
             "auto_init": True,
             "gitignore_template": "Python"
         }
-        response = requests.post(
-            f"{self.base_url}/user/repos",
-            headers=self.headers,
+        response = self._request(
+            "POST",
+            "/user/repos",
             json=data
         )
         response.raise_for_status()
@@ -53,10 +311,7 @@ class GitHubClient:
     def get_file_content(self, owner: str, repo: str, path: str) -> Optional[Dict]:
         """Get file content from repository"""
         try:
-            response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}/contents/{path}",
-                headers=self.headers
-            )
+            response = self._request("GET", f"/repos/{owner}/{repo}/contents/{path}")
             if response.status_code == 404:
                 return None
             response.raise_for_status()
@@ -77,9 +332,9 @@ class GitHubClient:
         if sha:
             data["sha"] = sha
         
-        response = requests.put(
-            f"{self.base_url}/repos/{owner}/{repo}/contents/{path}",
-            headers=self.headers,
+        response = self._request(
+            "PUT",
+            f"/repos/{owner}/{repo}/contents/{path}",
             json=data
         )
         response.raise_for_status()
@@ -93,58 +348,28 @@ class GitHubClient:
             username = user_info["login"]
             
             # Check if repository exists
+            repo = {}
             try:
-                repo_response = requests.get(
-                    f"{self.base_url}/repos/{username}/{repo_name}",
-                    headers=self.headers
-                )
-                if repo_response.status_code == 404:
-                    # Create repository if it doesn't exist
-                    self.create_repository(
-                        name=repo_name,
-                        description="My LeetCode solutions",
-                        private=False
-                    )
+                repo = self._ensure_repository(username, repo_name)
             except requests.RequestException:
                 pass
             
-            # Prepare file path and content
+            filename, full_content = self._build_solution_file(solution_data)
             problem_title = solution_data.get("title", "Unknown Problem")
-            difficulty = solution_data.get("difficulty", "").lower()
-            language = solution_data.get("language", "python").lower()
-            
-            # Create organized folder structure
-            folder = f"{difficulty}/" if difficulty else ""
-            timestamp = datetime.now().strftime("%Y%m%d")
-            
-            # Sanitize filename
-            safe_title = "".join(c for c in problem_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_title = safe_title.replace(' ', '_').lower()[:50]
-            
-            filename = f"{folder}{safe_title}_{timestamp}.{language}"
-            
-            # Add metadata comment to solution
-            metadata_comment = self._generate_solution_header(solution_data)
-            full_content = f"{metadata_comment}\n\n{solution_data['content']}"
             
             # Check if file already exists
-            existing_file = self.get_file_content(username, repo_name, filename)
-            sha = existing_file["sha"] if existing_file else None
-            
-            # Create commit message
-            commit_message = f"Add solution: {problem_title}"
-            if sha:
-                commit_message = f"Update solution: {problem_title}"
-            
-            # Push file to repository
-            result = self.create_or_update_file(
-                owner=username,
-                repo=repo_name,
-                path=filename,
-                content=full_content,
-                message=commit_message,
-                sha=sha
-            )
+            sha = self._get_file_sha(username, repo_name, filename, repo.get("default_branch"))
+            
+            try:
+                result = self._put_solution_file(username, repo_name, filename, full_content, problem_title, sha)
+            except requests.HTTPError as e:
+                # A stale cached SHA is rejected with 409/422; refetch it once and retry
+                if e.response is None or e.response.status_code not in (409, 422):
+                    raise
+                self._forget_file_shas(username, repo_name)
+                existing_file = self.get_file_content(username, repo_name, filename)
+                sha = existing_file["sha"] if existing_file else None
+                result = self._put_solution_file(username, repo_name, filename, full_content, problem_title, sha)
             
             return {
                 "success": True,
@@ -159,6 +384,215 @@ class GitHubClient:
                 "error": str(e)
             }
     
+    def _put_solution_file(self, username: str, repo_name: str, filename: str,
+                           full_content: str, problem_title: str, sha: Optional[str]) -> Dict:
+        """Create or update a solution file and remember its new SHA"""
+        # Create commit message
+        commit_message = f"Add solution: {problem_title}"
+        if sha:
+            commit_message = f"Update solution: {problem_title}"
+        
+        # Push file to repository
+        result = self.create_or_update_file(
+            owner=username,
+            repo=repo_name,
+            path=filename,
+            content=full_content,
+            message=commit_message,
+            sha=sha
+        )
+        self._remember_file_shas(username, repo_name, {filename: result["content"]["sha"]})
+        return result
+    
+    def push_solutions_batch(self, solutions: List[Dict], repo_name: str = "leetcode-solutions") -> List[Dict]:
+        """Push many LeetCode solutions in a single commit using the Git Data API
+        
+        Costs one blob request per solution plus a constant number of ref, tree
+        and commit requests, instead of a Contents API round trip per file.
+        Returns one result dict per solution, in input order.
+        """
+        if not solutions:
+            return []
+        
+        try:
+            username = self.get_user_info()["login"]
+            repo = self._ensure_repository(username, repo_name)
+            branch = repo.get("default_branch") or "main"
+            repo_path = f"/repos/{username}/{repo_name}"
+            
+            # Resolve the branch head; an empty repository has no ref yet
+            parent_sha = None
+            base_tree_sha = None
+            ref_response = self._request("GET", f"{repo_path}/git/ref/heads/{branch}")
+            if ref_response.status_code not in (404, 409):
+                ref_response.raise_for_status()
+                parent_sha = ref_response.json()["object"]["sha"]
+                
+                commit_response = self._request("GET", f"{repo_path}/git/commits/{parent_sha}")
+                commit_response.raise_for_status()
+                base_tree_sha = commit_response.json()["tree"]["sha"]
+            
+            # Later solutions for the same path win, matching sequential pushes
+            files = {}
+            titles = {}
+            paths = []
+            for solution_data in solutions:
+                filename, full_content = self._build_solution_file(solution_data)
+                files[filename] = full_content
+                titles[filename] = solution_data.get("title", "Unknown Problem")
+                paths.append(filename)
+            
+            tree_entries = []
+            for filename, full_content in files.items():
+                blob_response = self._request(
+                    "POST",
+                    f"{repo_path}/git/blobs",
+                    json={
+                        "content": base64.b64encode(full_content.encode('utf-8')).decode('utf-8'),
+                        "encoding": "base64"
+                    },
+                    idempotent=True
+                )
+                blob_response.raise_for_status()
+                tree_entries.append({
+                    "path": filename,
+                    "mode": "100644",
+                    "type": "blob",
+                    "sha": blob_response.json()["sha"]
+                })
+            
+            tree_data = {"tree": tree_entries}
+            if base_tree_sha:
+                tree_data["base_tree"] = base_tree_sha
+            tree_response = self._request("POST", f"{repo_path}/git/trees", json=tree_data, idempotent=True)
+            tree_response.raise_for_status()
+            
+            commit_message = f"Add {len(files)} solution{'s' if len(files) != 1 else ''}\n\n"
+            commit_message += "\n".join(f"- {title}" for title in titles.values())
+            commit_response = self._request(
+                "POST",
+                f"{repo_path}/git/commits",
+                json={
+                    "message": commit_message,
+                    "tree": tree_response.json()["sha"],
+                    "parents": [parent_sha] if parent_sha else []
+                }
+            )
+            commit_response.raise_for_status()
+            commit_sha = commit_response.json()["sha"]
+            
+            # Fast-forward only: a concurrent push makes this fail rather than drop commits
+            if parent_sha:
+                ref_update = self._request(
+                    "PATCH",
+                    f"{repo_path}/git/refs/heads/{branch}",
+                    json={"sha": commit_sha, "force": False}
+                )
+            else:
+                ref_update = self._request(
+                    "POST",
+                    f"{repo_path}/git/refs",
+                    json={"ref": f"refs/heads/{branch}", "sha": commit_sha}
+                )
+            ref_update.raise_for_status()
+            
+            self._remember_file_shas(username, repo_name, {entry["path"]: entry["sha"] for entry in tree_entries})
+            
+            html_base = repo.get("html_url") or f"https://github.com/{username}/{repo_name}"
+            return [
+                {
+                    "success": True,
+                    "filename": filename,
+                    "url": f"{html_base}/blob/{branch}/{filename}",
+                    "message": f"Solution pushed successfully to {username}/{repo_name}"
+                }
+                for filename in paths
+            ]
+            
+        except Exception as e:
+            return [{"success": False, "error": str(e)} for _ in solutions]
+    
+    def _ensure_repository(self, username: str, repo_name: str) -> Dict:
+        """Get repository data, creating the repository if it doesn't exist"""
+        path = f"/repos/{username}/{repo_name}"
+        repo = self._cached_get(path)
+        if repo is None:
+            repo = self.create_repository(
+                name=repo_name,
+                description="My LeetCode solutions",
+                private=False
+            )
+            self._store_metadata(path, repo)
+            self._forget_file_shas(username, repo_name)
+        return repo
+    
+    def _get_file_sha(self, owner: str, repo: str, path: str, branch: str = None) -> Optional[str]:
+        """Look up a file's blob SHA from the cached repository tree"""
+        with self._pool.lock:
+            file_shas = self._pool.file_shas.get((owner, repo))
+        
+        tree_path = f"/repos/{owner}/{repo}/git/trees/{branch or 'main'}?recursive=1"
+        
+        with self._pool.lock:
+            tree_entry = self._pool.metadata.get(tree_path)
+        tree_fresh = tree_entry and time.time() - tree_entry["fetched_at"] < self.metadata_ttl
+        
+        if file_shas is None or not tree_fresh:
+            # Empty repositories have no tree yet and answer 404/409
+            try:
+                tree = self._cached_get(tree_path) or {}
+            except requests.HTTPError:
+                tree = {}
+            if tree.get("truncated"):
+                existing_file = self.get_file_content(owner, repo, path)
+                return existing_file["sha"] if existing_file else None
+            
+            file_shas = {
+                item["path"]: item["sha"]
+                for item in tree.get("tree", [])
+                if item.get("type") == "blob"
+            }
+            with self._pool.lock:
+                # Keep SHAs recorded by our own pushes since the tree was fetched
+                file_shas.update(self._pool.file_shas.get((owner, repo), {}))
+                self._pool.file_shas[(owner, repo)] = file_shas
+        
+        return file_shas.get(path)
+    
+    def _remember_file_shas(self, owner: str, repo: str, shas: Dict[str, str]):
+        """Record blob SHAs written by this client"""
+        with self._pool.lock:
+            self._pool.file_shas.setdefault((owner, repo), {}).update(shas)
+    
+    def _forget_file_shas(self, owner: str, repo: str):
+        """Drop the cached path-to-SHA map so the next lookup refetches the tree"""
+        with self._pool.lock:
+            self._pool.file_shas.pop((owner, repo), None)
+            for path in [p for p in self._pool.metadata if p.startswith(f"/repos/{owner}/{repo}/git/trees/")]:
+                del self._pool.metadata[path]
+    
+    def _build_solution_file(self, solution_data: Dict) -> Tuple[str, str]:
+        """Build the repository path and file content for a solution"""
+        problem_title = solution_data.get("title", "Unknown Problem")
+        difficulty = solution_data.get("difficulty", "").lower()
+        language = solution_data.get("language", "python").lower()
+        
+        # Create organized folder structure
+        folder = f"{difficulty}/" if difficulty else ""
+        timestamp = datetime.now().strftime("%Y%m%d")
+        
+        # Sanitize filename
+        safe_title = "".join(c for c in problem_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = safe_title.replace(' ', '_').lower()[:50]
+        
+        filename = f"{folder}{safe_title}_{timestamp}.{language}"
+        
+        # Add metadata comment to solution
+        metadata_comment = self._generate_solution_header(solution_data)
+        full_content = f"{metadata_comment}\n\n{solution_data['content']}"
+        
+        return filename, full_content
+    
     def _generate_solution_header(self, solution_data: Dict) -> str:
         """Generate metadata header for solution file"""
         title = solution_data.get("title", "Unknown Problem")
@@ -179,42 +613,65 @@ class GitHubClient:
         return header
     
     def get_repository_stats(self, owner: str, repo: str) -> Dict:
-        """Get repository statistics"""
+        """Get repository statistics
+        
+        The repo, languages and commits requests are sent concurrently over the
+        token's pooled keep-alive session.
+        """
         try:
-            repo_response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}",
-                headers=self.headers
-            )
-            repo_response.raise_for_status()
-            repo_data = repo_response.json()
-            
-            # Get languages
-            languages_response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}/languages",
-                headers=self.headers
-            )
-            languages_response.raise_for_status()
-            languages = languages_response.json()
-            
-            # Get recent commits
-            commits_response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}/commits",
-                headers=self.headers,
-                params={"per_page": 10}
-            )
-            commits_response.raise_for_status()
-            commits = commits_response.json()
-            
-            return {
-                "name": repo_data["name"],
-                "description": repo_data["description"],
-                "stars": repo_data["stargazers_count"],
-                "forks": repo_data["forks_count"],
-                "languages": languages,
-                "recent_commits": len(commits),
-                "created_at": repo_data["created_at"],
-                "updated_at": repo_data["updated_at"]
-            }
-            
+            executor = _get_stats_executor()
+            futures = [
+                executor.submit(self._get_json, f"/repos/{owner}/{repo}"),
+                executor.submit(self._get_json, f"/repos/{owner}/{repo}/languages"),
+                executor.submit(self._get_json, f"/repos/{owner}/{repo}/commits", params={"per_page": 10})
+            ]
+            repo_data, languages, commits = (future.result() for future in futures)
+            return self._format_repository_stats(repo_data, languages, commits)
+        
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def _get_json(self, path: str, **kwargs):
+        response = self._request("GET", path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    
+    def get_repositories_stats(self, repositories: List[Tuple[str, str]]) -> List[Dict]:
+        """Get statistics for many (owner, repo) pairs concurrently, in input order
+        
+        Bulk requests go through AsyncGitHubClient, which amortizes its event loop
+        and session over the whole batch.
+        """
+        return self._run_async(lambda github: github.get_repositories_stats(repositories))
+    
+    def _format_repository_stats(self, repo_data: Dict, languages: Dict, commits: List[Dict]) -> Dict:
+        """Build the repository statistics dict from raw API responses"""
+        return {
+            "name": repo_data["name"],
+            "description": repo_data["description"],
+            "stars": repo_data["stargazers_count"],
+            "forks": repo_data["forks_count"],
+            "languages": languages,
+            "recent_commits": len(commits),
+            "created_at": repo_data["created_at"],
+            "updated_at": repo_data["updated_at"]
+        }
+    
+    def _run_async(self, operation: Callable):
+        """Run a coroutine against an AsyncGitHubClient for this token and return its result"""
+        from async_github_client import AsyncGitHubClient
+        
+        async def runner():
+            async with AsyncGitHubClient(self.access_token, max_retries=self.max_retries,
+                                         backoff_factor=self.backoff_factor, timeout=self.timeout) as github:
+                github.base_url = self.base_url
+                return await operation(github)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(runner())
+        
+        # Already inside an event loop (e.g. an async web handler): run on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, runner()).result()
@@ -0,0 +1,124 @@
+
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+
+class JobStore:
+    """SQLite table of scheduled notification jobs and when each last ran
+    
+    One row per (user_email, job_kind) holding the send time, weekdays and
+    timezone (NULL for server local time), so
+    the scheduler can rebuild every job with a single SELECT on startup and tell
+    which ones missed a run while the process was down. last_run starts at the
+    time a job is created or rescheduled, so no earlier runs are owed. Secrets
+    such as GitHub tokens are never stored, so backup jobs are not persisted.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scheduled_jobs (
+            user_email TEXT NOT NULL,
+            job_kind TEXT NOT NULL,
+            send_time TEXT NOT NULL,
+            weekdays TEXT NOT NULL,
+            timezone TEXT,
+            last_run TEXT,
+            PRIMARY KEY (user_email, job_kind)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, db_path: str = "data/scheduled_jobs.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        # Tables created before per-user timezones lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(scheduled_jobs)")}
+        if "timezone" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE scheduled_jobs ADD COLUMN timezone TEXT")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def upsert(self, user_email: str, job_kind: str, send_time: str, weekdays: Iterable[str],
+               timezone_name: str = None):
+        """Store a job; re-storing an unchanged schedule keeps its last_run"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO scheduled_jobs (user_email, job_kind, send_time, weekdays, timezone, last_run)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_email, job_kind) DO UPDATE SET
+                    last_run = CASE
+                        WHEN send_time = excluded.send_time AND weekdays = excluded.weekdays
+                            AND timezone IS excluded.timezone THEN last_run
+                        ELSE excluded.last_run
+                    END,
+                    send_time = excluded.send_time,
+                    weekdays = excluded.weekdays,
+                    timezone = excluded.timezone
+                """,
+                (user_email, job_kind, send_time, ",".join(weekdays), timezone_name,
+                 datetime.now(timezone.utc).isoformat())
+            )
+    
+    def delete(self, user_email: str, job_kind: str):
+        """Forget a job"""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM scheduled_jobs WHERE user_email = ? AND job_kind = ?", (user_email, job_kind))
+    
+    def mark_run(self, keys: Iterable[Tuple[str, str]], run_at: datetime):
+        """Record that the (user_email, job_kind) jobs ran at run_at"""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE scheduled_jobs SET last_run = ? WHERE user_email = ? AND job_kind = ?",
+                [(run_at.isoformat(), user_email, job_kind) for user_email, job_kind in keys]
+            )
+    
+    def load_all(self) -> List[Dict]:
+        """Every stored job, as dicts with a weekdays tuple and an aware UTC last_run"""
+        rows = self._connect().execute(
+            "SELECT user_email, job_kind, send_time, weekdays, timezone, last_run FROM scheduled_jobs"
+        ).fetchall()
+        return [
+            {
+                "user_email": user_email,
+                "job_kind": job_kind,
+                "send_time": send_time,
+                "weekdays": tuple(weekdays.split(",")),
+                "timezone": timezone_name,
+                "last_run": self._parse_time(last_run)
+            }
+            for user_email, job_kind, send_time, weekdays, timezone_name, last_run in rows
+        ]
+    
+    @staticmethod
+    def _parse_time(value: str):
+        if not value:
+            return None
+        moment = datetime.fromisoformat(value)
+        # Rows written before timestamps were stored in UTC hold naive local times
+        return moment.astimezone(timezone.utc)
+    
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,172 +1,418 @@
 
-import schedule
-import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Callable, Optional
+from typing import Dict, List, Callable, Optional, Tuple
 import logging
 import json
 import os
 from email_client import EmailClient
 from github_client import GitHubClient
+from backup_store import BackupStore
+from stats_store import StatsStore, JsonStatsStore, SQLiteStatsStore, create_stats_store
+from stats_aggregates import UserAggregates
+from day_stats import normalize_difficulty
+from timer_engine import TimerEngine, DailyTrigger, get_zone, utc_now
+from job_store import JobStore
+from email_queue import EmailQueue
+from config import Config
+
+JOB_KINDS = ("daily_summary", "weekly_report", "problem_reminder", "github_backup")
+
+# Job kinds delivered as emails through time buckets (see email_templates.TEMPLATES)
+NOTIFICATION_KINDS = ("daily_summary", "weekly_report", "problem_reminder")
 
 class LeetCodeScheduler:
     """Scheduler for automated LeetCode tasks and notifications"""
     
     def __init__(self):
         self.email_client = EmailClient()
-        self.running = False
-        self.scheduler_thread = None
+        self.email_queue = EmailQueue("data/email_queue.db", self.email_client)
+        self.timer = TimerEngine(max_workers=Config.SCHEDULER_MAX_WORKERS)
+        # Scheduled jobs keyed by (user_email, job_kind), mapping to the time bucket they
+        # belong to; each bucket is one timer job serving all of its users
+        self.jobs: Dict[Tuple[Optional[str], str], Tuple] = {}
+        self.buckets: Dict[Tuple, Dict] = {}
+        self.jobs_lock = threading.Lock()
+        self.job_store = JobStore("data/scheduled_jobs.db")
+        # Per bucket, the missed fire time and the users who missed it while the process was down;
+        # sent on start()
+        self.pending_catchup: Dict[Tuple, Tuple[datetime, List[str]]] = {}
         self.user_preferences = {}
-        self.daily_stats = {}
+        self.backup_store = BackupStore("backups")
+        self.stats_store: StatsStore = None
+        # Per-user rolling aggregates, built lazily from the store and updated on every push
+        self.user_aggregates: Dict[str, UserAggregates] = {}
+        self.aggregates_lock = threading.Lock()
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        self.timer.logger = self.logger
         
-        # Load user preferences
+        # Load user preferences, open the statistics backend and restore scheduled jobs
         self.load_preferences()
+        self.load_statistics()
+        self.load_jobs()
+    
+    @property
+    def running(self) -> bool:
+        return self.timer.running
     
     def start(self):
-        """Start the scheduler in a separate thread"""
+        """Start the timer thread and its worker pool"""
         if self.running:
             self.logger.warning("Scheduler is already running")
             return
         
-        self.running = True
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.scheduler_thread.start()
+        self.email_queue.start()
+        self.timer.start()
         self.logger.info("Scheduler started")
+        
+        pending, self.pending_catchup = self.pending_catchup, {}
+        for bucket_key, (fire_time, user_emails) in pending.items():
+            self.logger.info(f"Catching up missed {bucket_key[0]} for {len(user_emails)} users")
+            self.timer.submit(f"catchup:{bucket_key[0]}@{bucket_key[1]}",
+                              lambda key=bucket_key, users=user_emails, missed=fire_time:
+                              self._run_bucket(key, users, missed))
     
     def stop(self):
         """Stop the scheduler"""
-        self.running = False
-        if self.scheduler_thread:
-            self.scheduler_thread.join(timeout=5)
+        self.timer.stop(timeout=5)
+        self.email_queue.stop()
+        self.email_client.close()
+        self.stats_store.flush()
         self.logger.info("Scheduler stopped")
     
-    def _run_scheduler(self):
-        """Main scheduler loop"""
-        while self.running:
+    def _register_job(self, user_email: Optional[str], job_kind: str, trigger: DailyTrigger,
+                      func: Callable[[], None] = None, persist: bool = True):
+        """Add a user's job, replacing their existing job of the same kind
+        
+        Notification jobs join the shared bucket for their kind and trigger and are
+        saved to the job store; a job with its own func (backups) gets a bucket to
+        itself and lives only in memory.
+        """
+        with self.jobs_lock:
+            bucket_key = self._add_to_bucket(user_email, job_kind, trigger, func)
+        
+        if func is None and persist:
+            self.job_store.upsert(user_email, job_kind, trigger.at, trigger.weekday_names, trigger.timezone)
+        return bucket_key
+    
+    def _add_to_bucket(self, user_email: Optional[str], job_kind: str, trigger: DailyTrigger,
+                       func: Callable[[], None] = None) -> Tuple:
+        """Move a user's job into its bucket, creating the bucket's timer if needed
+        
+        Callers must hold jobs_lock.
+        """
+        if func is None:
+            bucket_key = (job_kind, trigger.at, trigger.weekdays, trigger.timezone)
+        else:
+            bucket_key = (job_kind, trigger.at, trigger.weekdays, trigger.timezone, user_email)
+        
+        self._unregister_job(user_email, job_kind)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            run = func or (lambda: self._run_bucket(bucket_key))
+            name = f"{job_kind}@{trigger.at}" if func is None else f"{job_kind}:{user_email}"
+            bucket = self.buckets[bucket_key] = {"job": self.timer.add(name, trigger, run), "users": set()}
+        bucket["users"].add(user_email)
+        self.jobs[(user_email, job_kind)] = bucket_key
+        return bucket_key
+    
+    def _unregister_job(self, user_email: Optional[str], job_kind: str) -> bool:
+        """Remove a user from their bucket, cancelling the bucket's timer once it is empty
+        
+        Callers must hold jobs_lock.
+        """
+        bucket_key = self.jobs.pop((user_email, job_kind), None)
+        if bucket_key is None:
+            return False
+        bucket = self.buckets[bucket_key]
+        bucket["users"].discard(user_email)
+        if not bucket["users"]:
+            self.timer.cancel(bucket["job"])
+            del self.buckets[bucket_key]
+        return True
+    
+    def _trigger(self, user_email: Optional[str], send_time: str, weekdays: List[str] = None) -> DailyTrigger:
+        """Build a trigger for send_time in the user's preferred timezone"""
+        return DailyTrigger(send_time, weekdays, self._user_timezone(user_email))
+    
+    def _user_timezone(self, user_email: Optional[str]) -> Optional[str]:
+        """The user's IANA timezone preference, or None for server local time"""
+        timezone_name = self.user_preferences.get(user_email, {}).get("timezone") if user_email else None
+        if timezone_name:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            except Exception as e:
-                self.logger.error(f"Scheduler error: {str(e)}")
-                time.sleep(60)
+                get_zone(timezone_name)
+            except ValueError as e:
+                self.logger.error(f"Ignoring timezone for {user_email}: {str(e)}")
+                return None
+        return timezone_name or None
+    
+    def _reschedule_user(self, user_email: str):
+        """Move a user's existing jobs onto triggers in their current timezone"""
+        with self.jobs_lock:
+            existing = [
+                (job_kind, self.buckets[self.jobs[(user_email, job_kind)]])
+                for job_kind in JOB_KINDS if (user_email, job_kind) in self.jobs
+            ]
+        
+        for job_kind, bucket in existing:
+            old = bucket["job"].trigger
+            trigger = self._trigger(user_email, old.at, old.weekday_names)
+            if trigger.timezone == old.timezone:
+                continue
+            # Backup buckets own their function; notification buckets are shared
+            func = bucket["job"].func if job_kind not in NOTIFICATION_KINDS else None
+            self._register_job(user_email, job_kind, trigger, func)
+    
+    def cancel_job(self, user_email: Optional[str], job_kind: str) -> bool:
+        """Cancel one of a user's scheduled jobs; returns False if there was none"""
+        with self.jobs_lock:
+            cancelled = self._unregister_job(user_email, job_kind)
+        if cancelled:
+            if job_kind in NOTIFICATION_KINDS:
+                self.job_store.delete(user_email, job_kind)
+            self.logger.info(f"Cancelled {job_kind} for {user_email}")
+        return cancelled
+    
+    def cancel_user_jobs(self, user_email: Optional[str]) -> int:
+        """Cancel every job scheduled for a user"""
+        return sum(self.cancel_job(user_email, job_kind) for job_kind in JOB_KINDS)
+    
+    def list_jobs(self, user_email: Optional[str] = None) -> List[Dict]:
+        """Describe scheduled jobs, optionally for a single user"""
+        with self.jobs_lock:
+            if user_email is not None:
+                keys = [(user_email, kind) for kind in JOB_KINDS if (user_email, kind) in self.jobs]
+            else:
+                keys = list(self.jobs)
+            entries = [(key, self.buckets[self.jobs[key]]["job"]) for key in keys]
+        
+        return [
+            {
+                "user_email": email,
+                "job_kind": kind,
+                "time": job.trigger.at,
+                "weekdays": job.trigger.weekday_names,
+                "timezone": job.trigger.timezone,
+                "next_run": job.next_run.isoformat() if job.next_run else None
+            }
+            for (email, kind), job in entries
+        ]
+    
+    def _run_bucket(self, bucket_key: Tuple, user_emails: List[str] = None, fire_time: datetime = None):
+        """Generate and queue one kind of notification for every user in a time bucket
+        
+        user_emails limits the run to those members of the bucket, and fire_time
+        names the scheduled instant being served (both used for catch-up).
+        """
+        job_kind = bucket_key[0]
+        started = utc_now()
+        with self.jobs_lock:
+            bucket = self.buckets.get(bucket_key)
+            if bucket is None:
+                return
+            user_emails = sorted(bucket["users"] if user_emails is None else bucket["users"].intersection(user_emails))
+            trigger = bucket["job"].trigger
+            # The scheduled instant this run serves; a catch-up and a late regular run share it
+            if fire_time is None:
+                fire_time = trigger.previous_before(started)
+        if not user_emails:
+            return
+        
+        try:
+            # Report on the day the job was due in the bucket's timezone, not the server's day at run time
+            payloads = self.generate_notifications(job_kind, user_emails, fire_time, trigger.timezone)
+        except Exception as e:
+            self.logger.error(f"Error generating {job_kind} for {len(user_emails)} users: {str(e)}")
+            return
+        
+        results = self._queue_notifications(job_kind, payloads, fire_time)
+        queued = [user_email for user_email, result in results.items() if result["success"]]
+        self.logger.info(f"Queued {len(queued)}/{len(payloads)} {job_kind} emails")
+        
+        # Users whose message could not be queued keep their old last_run, so a restart retries them
+        try:
+            self.job_store.mark_run([(user_email, job_kind) for user_email in queued], started)
+        except Exception as e:
+            self.logger.error(f"Failed to record {job_kind} runs: {str(e)}")
+    
+    def _queue_notifications(self, job_kind: str, payloads: Dict[str, Dict], fire_time: datetime) -> Dict[str, Dict]:
+        """Render a bucket's notifications into the email queue and return each user's result
+        
+        Messages are de-duplicated per user, kind and scheduled instant, so a run that
+        is repeated (e.g. catch-up racing the regular timer) never sends twice.
+        """
+        results = {}
+        try:
+            messages = self.email_client.build_messages(job_kind, payloads)
+        except Exception:
+            # Render one at a time so a single bad payload only fails its own user
+            messages = []
+            for user_email, data in payloads.items():
+                try:
+                    messages.append(self.email_client.build_message(job_kind, user_email, data))
+                except Exception as e:
+                    results[user_email] = {"success": False, "error": str(e)}
+        for message in messages:
+            message["dedup_key"] = f"{job_kind}:{message['to']}:{fire_time.isoformat()}"
+        
+        try:
+            queued = self.email_queue.enqueue_batch(messages)
+        except Exception as e:
+            queued = None
+            for message in messages:
+                results[message["to"]] = {"success": False, "error": str(e)}
+        
+        if queued is not None:
+            for message, is_new in zip(messages, queued):
+                results[message["to"]] = {"success": True, "duplicate": not is_new}
+        
+        for user_email, result in results.items():
+            if not result["success"]:
+                self.logger.error(f"Failed to queue {job_kind} for {user_email}: {result['error']}")
+        return results
     
     def schedule_daily_summary(self, user_email: str, send_time: str = "18:00"):
         """Schedule daily summary emails"""
-        def send_summary():
-            try:
-                summary_data = self.generate_daily_summary(user_email)
-                result = self.email_client.send_daily_summary(user_email, summary_data)
-                if result["success"]:
-                    self.logger.info(f"Daily summary sent to {user_email}")
-                else:
-                    self.logger.error(f"Failed to send daily summary: {result['error']}")
-            except Exception as e:
-                self.logger.error(f"Error sending daily summary: {str(e)}")
-        
-        schedule.every().day.at(send_time).do(send_summary)
+        self._register_job(user_email, "daily_summary", self._trigger(user_email, send_time))
         self.logger.info(f"Scheduled daily summary for {user_email} at {send_time}")
     
     def schedule_weekly_report(self, user_email: str, day: str = "sunday", send_time: str = "19:00"):
         """Schedule weekly progress reports"""
-        def send_weekly_report():
-            try:
-                report_data = self.generate_weekly_report(user_email)
-                result = self.email_client.send_weekly_report(user_email, report_data)
-                if result["success"]:
-                    self.logger.info(f"Weekly report sent to {user_email}")
-                else:
-                    self.logger.error(f"Failed to send weekly report: {result['error']}")
-            except Exception as e:
-                self.logger.error(f"Error sending weekly report: {str(e)}")
-        
-        getattr(schedule.every(), day.lower()).at(send_time).do(send_weekly_report)
+        self._register_job(user_email, "weekly_report", self._trigger(user_email, send_time, [day]))
         self.logger.info(f"Scheduled weekly report for {user_email} on {day} at {send_time}")
     
     def schedule_problem_reminder(self, user_email: str, frequency: str = "daily", send_time: str = "09:00"):
         """Schedule problem-solving reminders"""
-        def send_reminder():
-            try:
-                reminder_data = self.generate_problem_reminder(user_email)
-                result = self.email_client.send_problem_reminder(user_email, reminder_data)
-                if result["success"]:
-                    self.logger.info(f"Problem reminder sent to {user_email}")
-                else:
-                    self.logger.error(f"Failed to send problem reminder: {result['error']}")
-            except Exception as e:
-                self.logger.error(f"Error sending problem reminder: {str(e)}")
-        
         if frequency.lower() == "daily":
-            schedule.every().day.at(send_time).do(send_reminder)
+            trigger = self._trigger(user_email, send_time)
         elif frequency.lower() == "weekly":
-            schedule.every().monday.at(send_time).do(send_reminder)
+            trigger = self._trigger(user_email, send_time, ["monday"])
         elif frequency.lower() == "weekdays":
-            for day in ["monday", "tuesday", "wednesday", "thursday", "friday"]:
-                getattr(schedule.every(), day).at(send_time).do(send_reminder)
+            trigger = self._trigger(user_email, send_time, ["monday", "tuesday", "wednesday", "thursday", "friday"])
+        else:
+            self.logger.error(f"Unknown reminder frequency: {frequency}")
+            return
         
+        self._register_job(user_email, "problem_reminder", trigger)
         self.logger.info(f"Scheduled {frequency} problem reminder for {user_email} at {send_time}")
     
-    def schedule_github_backup(self, github_token: str, backup_time: str = "02:00"):
-        """Schedule daily GitHub repository backup"""
+    def schedule_github_backup(self, github_token: str, backup_time: str = "02:00", incremental: bool = True,
+                               user_email: str = None):
+        """Schedule daily GitHub repository backup
+        
+        Pass user_email to keep one backup job per user; without it there is a single
+        shared backup job. Each incremental backup trims its own user's manifests, and
+        one shared nightly job at BACKUP_PRUNE_TIME deletes chunks no manifest uses.
+        """
         def backup_repos():
             try:
                 github_client = GitHubClient(github_token)
-                result = self.backup_repositories(github_client)
+                result = self.backup_repositories(github_client, incremental=incremental)
                 if result["success"]:
                     self.logger.info("GitHub repositories backed up successfully")
+                    if incremental and Config.BACKUP_KEEP_MANIFESTS > 0:
+                        self.prune_backups(Config.BACKUP_KEEP_MANIFESTS, result["user"])
                 else:
                     self.logger.error(f"GitHub backup failed: {result['error']}")
             except Exception as e:
                 self.logger.error(f"Error during GitHub backup: {str(e)}")
         
-        schedule.every().day.at(backup_time).do(backup_repos)
+        self._register_job(user_email, "github_backup", self._trigger(user_email, backup_time), backup_repos)
         self.logger.info(f"Scheduled daily GitHub backup at {backup_time}")
+        if incremental and Config.BACKUP_KEEP_MANIFESTS > 0:
+            self._register_job(None, "backup_prune", self._trigger(None, Config.BACKUP_PRUNE_TIME),
+                               lambda: self.prune_backups(Config.BACKUP_KEEP_MANIFESTS))
     
     def record_solution_push(self, user_email: str, solution_data: Dict):
         """Record a solution push for statistics"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        if user_email not in self.daily_stats:
-            self.daily_stats[user_email] = {}
-        
-        if today not in self.daily_stats[user_email]:
-            self.daily_stats[user_email][today] = {
-                "problems_solved": 0,
-                "total_pushes": 0,
-                "languages_used": set(),
-                "difficulties": {"Easy": 0, "Medium": 0, "Hard": 0},
-                "solutions": []
-            }
-        
-        daily_data = self.daily_stats[user_email][today]
-        daily_data["problems_solved"] += 1
-        daily_data["total_pushes"] += 1
-        daily_data["languages_used"].add(solution_data.get("language", "unknown"))
-        
-        difficulty = solution_data.get("difficulty", "Unknown")
-        if difficulty in daily_data["difficulties"]:
-            daily_data["difficulties"][difficulty] += 1
-        
-        daily_data["solutions"].append({
+        # One clock reading, so the stored date and the aggregate day agree around midnight
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        solution = {
             "title": solution_data.get("title", "Unknown"),
-            "difficulty": difficulty,
+            # Clients send "easy", "EASY" and so on; every backend and the aggregates expect "Easy"
+            "difficulty": normalize_difficulty(solution_data.get("difficulty")),
             "language": solution_data.get("language", "unknown"),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "url": solution_data.get("url", "")
-        })
+        }
         
-        # Save statistics
-        self.save_statistics()
+        # Store and aggregates change together: an aggregate built from the store in between
+        # would already contain this push and count it twice
+        with self.aggregates_lock:
+            try:
+                self.stats_store.record_push(user_email, today, solution)
+            except Exception as e:
+                self.logger.error(f"Failed to record solution push: {str(e)}")
+                return
+            
+            # Users without aggregates yet pick this push up when they are first built
+            aggregates = self.user_aggregates.get(user_email)
+            if aggregates is not None:
+                aggregates.add(
+                    now.toordinal(),
+                    difficulties={solution["difficulty"]: 1},
+                    languages=[solution["language"]]
+                )
+    
+    def _get_aggregates(self, user_email: str) -> UserAggregates:
+        """Get a user's rolling aggregates, building them from the store on first use"""
+        with self.aggregates_lock:
+            aggregates = self.user_aggregates.get(user_email)
+            if aggregates is None:
+                aggregates = UserAggregates()
+                for date_str, daily_data in self.stats_store.get_range(user_email, "0000-01-01", "9999-12-31").items():
+                    languages = [solution["language"] for solution in daily_data["solutions"]]
+                    aggregates.add(
+                        datetime.strptime(date_str, '%Y-%m-%d').toordinal(),
+                        problems_solved=daily_data["problems_solved"],
+                        total_pushes=daily_data["total_pushes"],
+                        difficulties=daily_data["difficulties"],
+                        languages=languages or daily_data["languages_used"]
+                    )
+                self.user_aggregates[user_email] = aggregates
+            return aggregates
+    
+    def generate_notifications(self, job_kind: str, user_emails: List[str], fire_time: datetime = None,
+                               timezone_name: str = None) -> Dict[str, Dict]:
+        """Build one kind of notification for many users from a single store query
+        
+        The report covers the day of fire_time (an aware datetime, default now) in
+        timezone_name, or in server local time when that is None.
+        """
+        zone = get_zone(timezone_name) if timezone_name else None
+        now = (fire_time or utc_now()).astimezone(zone).replace(tzinfo=None)
+        today = now.strftime('%Y-%m-%d')
+        
+        if job_kind == "weekly_report":
+            start_date = now - timedelta(days=7)
+            first_day = (start_date + timedelta(days=1)).strftime('%Y-%m-%d')
+            days = self.stats_store.get_range_for_users(user_emails, first_day, today)
+            return {
+                user_email: self._build_weekly_report(start_date, now, days[user_email])
+                for user_email in user_emails
+            }
+        
+        days = self.stats_store.get_range_for_users(user_emails, today, today)
+        if job_kind == "daily_summary":
+            return {user_email: self._build_daily_summary(days[user_email].get(today)) for user_email in user_emails}
+        if job_kind == "problem_reminder":
+            return {
+                user_email: self._build_problem_reminder(user_email, days[user_email].get(today))
+                for user_email in user_emails
+            }
+        raise ValueError(f"Unknown notification kind: {job_kind}")
     
     def generate_daily_summary(self, user_email: str) -> Dict:
         """Generate daily summary data"""
         today = datetime.now().strftime('%Y-%m-%d')
-        
-        if user_email not in self.daily_stats or today not in self.daily_stats[user_email]:
+        return self._build_daily_summary(self.stats_store.get_day(user_email, today))
+    
+    def _build_daily_summary(self, daily_data: Optional[Dict]) -> Dict:
+        if daily_data is None:
             return {
                 "problems_solved": 0,
                 "total_pushes": 0,
@@ -175,7 +421,7 @@ class LeetCodeScheduler:
                 "solutions": []
             }
         
-        daily_data = self.daily_stats[user_email][today].copy()
+        daily_data = daily_data.copy()
         daily_data["languages_used"] = list(daily_data["languages_used"])
         return daily_data
     
@@ -184,6 +430,12 @@ class LeetCodeScheduler:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
         
+        # Days whose midnight falls inside the last 7 * 24 hours
+        first_day = (start_date + timedelta(days=1)).strftime('%Y-%m-%d')
+        days = self.stats_store.get_range(user_email, first_day, end_date.strftime('%Y-%m-%d'))
+        return self._build_weekly_report(start_date, end_date, days)
+    
+    def _build_weekly_report(self, start_date: datetime, end_date: datetime, days: Dict[str, Dict]) -> Dict:
         weekly_stats = {
             "start_date": start_date.strftime('%Y-%m-%d'),
             "end_date": end_date.strftime('%Y-%m-%d'),
@@ -195,19 +447,16 @@ class LeetCodeScheduler:
             "solutions": []
         }
         
-        if user_email in self.daily_stats:
-            for date_str, daily_data in self.daily_stats[user_email].items():
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                if start_date <= date_obj <= end_date:
-                    weekly_stats["total_problems"] += daily_data["problems_solved"]
-                    weekly_stats["total_pushes"] += daily_data["total_pushes"]
-                    weekly_stats["languages_used"].update(daily_data["languages_used"])
-                    
-                    for difficulty, count in daily_data["difficulties"].items():
-                        weekly_stats["difficulties"][difficulty] += count
-                    
-                    weekly_stats["daily_breakdown"][date_str] = daily_data["problems_solved"]
-                    weekly_stats["solutions"].extend(daily_data["solutions"])
+        for date_str, daily_data in days.items():
+            weekly_stats["total_problems"] += daily_data["problems_solved"]
+            weekly_stats["total_pushes"] += daily_data["total_pushes"]
+            weekly_stats["languages_used"].update(daily_data["languages_used"])
+            
+            for difficulty, count in daily_data["difficulties"].items():
+                weekly_stats["difficulties"][difficulty] += count
+            
+            weekly_stats["daily_breakdown"][date_str] = daily_data["problems_solved"]
+            weekly_stats["solutions"].extend(daily_data["solutions"])
         
         weekly_stats["languages_used"] = list(weekly_stats["languages_used"])
         return weekly_stats
@@ -215,12 +464,13 @@ class LeetCodeScheduler:
     def generate_problem_reminder(self, user_email: str) -> Dict:
         """Generate problem reminder data"""
         today = datetime.now().strftime('%Y-%m-%d')
-        
+        return self._build_problem_reminder(user_email, self.stats_store.get_day(user_email, today))
+    
+    def _build_problem_reminder(self, user_email: str, daily_data: Optional[Dict]) -> Dict:
         # Check if user solved any problems today
         solved_today = 0
-        if (user_email in self.daily_stats and 
-            today in self.daily_stats[user_email]):
-            solved_today = self.daily_stats[user_email][today]["problems_solved"]
+        if daily_data is not None:
+            solved_today = daily_data["problems_solved"]
         
         # Get user preferences
         user_prefs = self.user_preferences.get(user_email, {})
@@ -235,47 +485,113 @@ class LeetCodeScheduler:
             "motivational_message": self._get_motivational_message(solved_today, target_problems)
         }
     
-    def backup_repositories(self, github_client: GitHubClient) -> Dict:
-        """Backup GitHub repositories"""
+    def backup_repositories(self, github_client: GitHubClient, incremental: bool = False) -> Dict:
+        """Backup GitHub repositories
+        
+        With incremental=True only repositories changed since the previous backup are
+        written, as content-addressed chunks referenced by a manifest (see BackupStore).
+        """
         try:
             user_info = github_client.get_user_info()
-            repos = github_client.list_repositories(per_page=100)
             
-            backup_data = {
-                "timestamp": datetime.now().isoformat(),
-                "user": user_info["login"],
-                "total_repos": len(repos),
-                "repositories": []
-            }
-            
-            for repo in repos:
-                repo_data = {
-                    "name": repo["name"],
-                    "description": repo["description"],
-                    "private": repo["private"],
-                    "stars": repo["stargazers_count"],
-                    "forks": repo["forks_count"],
-                    "language": repo["language"],
-                    "created_at": repo["created_at"],
-                    "updated_at": repo["updated_at"],
-                    "clone_url": repo["clone_url"]
+            if incremental:
+                records = (self._repo_backup_record(repo) for repo in github_client.iter_repositories())
+                manifest = self.backup_store.create_backup(user_info["login"], records)
+                return {
+                    "success": True,
+                    "user": manifest["user"],
+                    "backup_file": manifest["name"],
+                    "repos_backed_up": manifest["total_repos"],
+                    "repos_changed": manifest["changed_repos"]
                 }
-                backup_data["repositories"].append(repo_data)
             
-            # Save backup data
+            # Stream every page of repositories straight to disk so memory stays flat
+            os.makedirs("backups", exist_ok=True)
             backup_filename = f"github_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(f"backups/{backup_filename}", "w") as f:
-                json.dump(backup_data, f, indent=2)
+            backup_path = f"backups/{backup_filename}"
             
-            return {"success": True, "backup_file": backup_filename, "repos_backed_up": len(repos)}
+            repo_count = 0
+            tmp_path = f"{backup_path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write("{\n")
+                    f.write(f'  "timestamp": {json.dumps(datetime.now().isoformat())},\n')
+                    f.write(f'  "user": {json.dumps(user_info["login"])},\n')
+                    f.write('  "repositories": [')
+                    
+                    for repo in github_client.iter_repositories():
+                        f.write(("," if repo_count else "") + "\n    " + json.dumps(self._repo_backup_record(repo)))
+                        repo_count += 1
+                    
+                    f.write("\n  ],\n")
+                    f.write(f'  "total_repos": {repo_count}\n')
+                    f.write("}\n")
+                
+                # Only complete backups ever appear under the final name
+                os.replace(tmp_path, backup_path)
+            except BaseException:
+                # A listing that failed partway leaves nothing behind
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             
+            return {"success": True, "backup_file": backup_filename, "repos_backed_up": repo_count}
+        
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _repo_backup_record(self, repo: Dict) -> Dict:
+        """Select the repository fields kept in backups"""
+        return {
+            "name": repo["name"],
+            "description": repo["description"],
+            "private": repo["private"],
+            "stars": repo["stargazers_count"],
+            "forks": repo["forks_count"],
+            "language": repo["language"],
+            "created_at": repo["created_at"],
+            "updated_at": repo["updated_at"],
+            "pushed_at": repo.get("pushed_at"),
+            "clone_url": repo["clone_url"]
+        }
+    
+    def restore_backup(self, manifest_name: str = None, user: str = None) -> Dict:
+        """Rebuild a full repository snapshot from an incremental backup"""
+        try:
+            snapshot = self.backup_store.restore(manifest_name, user)
+            if snapshot is None:
+                return {"success": False, "error": "No matching backup manifest found"}
+            return {"success": True, "backup": snapshot}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def prune_backups(self, keep_last: int = 30, github_user: str = None) -> Dict:
+        """Delete old incremental backup manifests and chunks they no longer reference
+        
+        With github_user, only that user's old manifests are removed (see BackupStore.prune).
+        """
+        try:
+            result = self.backup_store.prune(keep_last, github_user)
+            self.logger.info(f"Pruned {result['manifests_removed']} backup manifests and {result['chunks_removed']} chunks")
+            return {"success": True, **result}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def set_user_preferences(self, user_email: str, preferences: Dict):
-        """Set user preferences"""
+        """Set user preferences
+        
+        A "timezone" preference (IANA name, e.g. "Asia/Kolkata") moves the user's
+        scheduled jobs to that timezone; without one they follow server local time.
+        """
+        timezone_name = preferences.get("timezone")
+        if timezone_name:
+            get_zone(timezone_name)
+        
+        previous_timezone = self.user_preferences.get(user_email, {}).get("timezone")
         self.user_preferences[user_email] = preferences
         self.save_preferences()
+        if timezone_name != previous_timezone:
+            self._reschedule_user(user_email)
     
     def load_preferences(self):
         """Load user preferences from file"""
@@ -287,6 +603,44 @@ class LeetCodeScheduler:
             self.logger.error(f"Failed to load preferences: {str(e)}")
             self.user_preferences = {}
     
+    def load_jobs(self):
+        """Rebuild scheduled notification jobs from the job store
+        
+        Jobs whose last scheduled time passed while the process was down, within
+        SCHEDULER_CATCHUP_HOURS, are queued for catch-up when the scheduler starts.
+        """
+        try:
+            rows = self.job_store.load_all()
+        except Exception as e:
+            self.logger.error(f"Failed to load scheduled jobs: {str(e)}")
+            return
+        
+        now = utc_now()
+        catchup_window = timedelta(hours=Config.SCHEDULER_CATCHUP_HOURS)
+        # Users share a handful of distinct schedules, so parse each one once
+        triggers = {}
+        with self.jobs_lock:
+            for row in rows:
+                schedule_key = (row["send_time"], row["weekdays"], row["timezone"])
+                if schedule_key not in triggers:
+                    try:
+                        trigger = DailyTrigger(*schedule_key)
+                        triggers[schedule_key] = (trigger, trigger.previous_before(now))
+                    except ValueError as e:
+                        self.logger.error(f"Skipping stored jobs at {row['send_time']}: {str(e)}")
+                        triggers[schedule_key] = None
+                if triggers[schedule_key] is None:
+                    continue
+                
+                trigger, missed = triggers[schedule_key]
+                bucket_key = self._add_to_bucket(row["user_email"], row["job_kind"], trigger)
+                if (catchup_window and now - missed <= catchup_window
+                        and (row["last_run"] is None or row["last_run"] < missed)):
+                    self.pending_catchup.setdefault(bucket_key, (missed, []))[1].append(row["user_email"])
+        
+        if rows:
+            self.logger.info(f"Restored {len(rows)} scheduled jobs in {len(self.buckets)} time buckets")
+    
     def save_preferences(self):
         """Save user preferences to file"""
         try:
@@ -297,37 +651,47 @@ class LeetCodeScheduler:
             self.logger.error(f"Failed to save preferences: {str(e)}")
     
     def load_statistics(self):
-        """Load statistics from file"""
+        """Open the statistics backend selected by DATABASE_URL
+        
+        A SQLite backend that cannot be opened or migrated stops start-up rather than
+        falling back to JSON, which would split new statistics across two stores.
+        """
         try:
-            if os.path.exists("data/daily_stats.json"):
-                with open("data/daily_stats.json", "r") as f:
-                    loaded_stats = json.load(f)
-                    # Convert sets back from lists
-                    for user_email, user_data in loaded_stats.items():
-                        for date, daily_data in user_data.items():
-                            if "languages_used" in daily_data:
-                                daily_data["languages_used"] = set(daily_data["languages_used"])
-                    self.daily_stats = loaded_stats
+            self.stats_store = create_stats_store(
+                Config.DATABASE_URL,
+                compact_every=Config.STATS_COMPACT_EVERY,
+                fsync_interval=Config.STATS_FSYNC_INTERVAL,
+                fsync_batch=Config.STATS_FSYNC_BATCH
+            )
+            if isinstance(self.stats_store, SQLiteStatsStore):
+                imported = self.stats_store.migrate_from_json("data/daily_stats.json", "data/daily_stats.log.jsonl")
+                if imported:
+                    self.logger.info(f"Migrated {imported} daily statistics records into SQLite")
+            self.logger.info(f"Statistics backend: {type(self.stats_store).__name__}")
         except Exception as e:
-            self.logger.error(f"Failed to load statistics: {str(e)}")
-            self.daily_stats = {}
+            if Config.DATABASE_URL and Config.DATABASE_URL.startswith("sqlite:///"):
+                self.logger.error(f"Failed to open SQLite statistics at {Config.DATABASE_URL}: {str(e)}")
+                raise
+            self.logger.error(f"Failed to load statistics, reloading JSON statistics: {str(e)}")
+            # A corrupt snapshot has been moved aside by now, so this reloads only what is still readable
+            self.stats_store = JsonStatsStore(
+                compact_every=Config.STATS_COMPACT_EVERY,
+                fsync_interval=Config.STATS_FSYNC_INTERVAL,
+                fsync_batch=Config.STATS_FSYNC_BATCH
+            )
+            try:
+                self.stats_store.load()
+            except Exception as e:
+                self.logger.error(f"Starting with empty statistics: {str(e)}")
+                self.stats_store.daily_stats = {}
     
     def save_statistics(self):
-        """Save statistics to file"""
+        """Flush statistics, compacting the JSON snapshot when that backend is in use"""
         try:
-            os.makedirs("data", exist_ok=True)
-            # Convert sets to lists for JSON serialization
-            stats_to_save = {}
-            for user_email, user_data in self.daily_stats.items():
-                stats_to_save[user_email] = {}
-                for date, daily_data in user_data.items():
-                    daily_copy = daily_data.copy()
-                    if "languages_used" in daily_copy:
-                        daily_copy["languages_used"] = list(daily_copy["languages_used"])
-                    stats_to_save[user_email][date] = daily_copy
-            
-            with open("data/daily_stats.json", "w") as f:
-                json.dump(stats_to_save, f, indent=2)
+            if hasattr(self.stats_store, "compact"):
+                self.stats_store.compact()
+            else:
+                self.stats_store.flush()
         except Exception as e:
             self.logger.error(f"Failed to save statistics: {str(e)}")
     
@@ -359,74 +723,40 @@ class LeetCodeScheduler:
         return random.choice(messages)
     
     def get_user_stats(self, user_email: str, days: int = 30) -> Dict:
-        """Get user statistics for the last N days"""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        """Get user statistics for the last N days, ending today
+        
+        Answered from the user's rolling aggregates: two bisections for the totals,
+        plus the streak runs that overlap the window.
+        """
+        today = datetime.now().date()
+        window = self._get_aggregates(user_email).window(today.toordinal() - days + 1, today.toordinal())
         
-        stats = {
+        return {
             "period_days": days,
-            "total_problems": 0,
-            "total_pushes": 0,
-            "languages_used": set(),
-            "difficulties": {"Easy": 0, "Medium": 0, "Hard": 0},
-            "daily_data": {},
-            "streak": 0,
-            "longest_streak": 0
+            "total_problems": window["total_problems"],
+            "total_pushes": window["total_pushes"],
+            "languages_used": list(window["languages_used"]),
+            "difficulties": window["difficulties"],
+            "daily_data": {
+                datetime.fromordinal(ordinal).strftime('%Y-%m-%d'): problems
+                for ordinal, problems in window["daily_data"].items()
+            },
+            "streak": window["streak"],
+            "longest_streak": window["longest_streak"]
         }
-        
-        if user_email in self.daily_stats:
-            current_streak = 0
-            longest_streak = 0
-            yesterday = datetime.now() - timedelta(days=1)
-            
-            for i in range(days):
-                date = (start_date + timedelta(days=i)).strftime('%Y-%m-%d')
-                if date in self.daily_stats[user_email]:
-                    daily_data = self.daily_stats[user_email][date]
-                    stats["total_problems"] += daily_data["problems_solved"]
-                    stats["total_pushes"] += daily_data["total_pushes"]
-                    stats["languages_used"].update(daily_data["languages_used"])
-                    
-                    for difficulty, count in daily_data["difficulties"].items():
-                        stats["difficulties"][difficulty] += count
-                    
-                    stats["daily_data"][date] = daily_data["problems_solved"]
-                    
-                    # Calculate streaks
-                    if daily_data["problems_solved"] > 0:
-                        current_streak += 1
-                        longest_streak = max(longest_streak, current_streak)
-                    else:
-                        current_streak = 0
-        
-        stats["languages_used"] = list(stats["languages_used"])
-        stats["longest_streak"] = longest_streak
-        
-        # Check if current streak continues to today
-        today = datetime.now().strftime('%Y-%m-%d')
-        if (user_email in self.daily_stats and 
-            today in self.daily_stats[user_email] and
-            self.daily_stats[user_email][today]["problems_solved"] > 0):
-            stats["streak"] = current_streak
-        else:
-            stats["streak"] = 0
-        
-        return stats
     
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old statistical data"""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         cutoff_str = cutoff_date.strftime('%Y-%m-%d')
         
-        cleaned_count = 0
-        for user_email in list(self.daily_stats.keys()):
-            for date_str in list(self.daily_stats[user_email].keys()):
-                if date_str < cutoff_str:
-                    del self.daily_stats[user_email][date_str]
-                    cleaned_count += 1
+        cleaned_count = self.stats_store.delete_before(cutoff_str)
+        
+        # Aggregates are rebuilt from the trimmed store on next use
+        with self.aggregates_lock:
+            self.user_aggregates.clear()
         
         if cleaned_count > 0:
-            self.save_statistics()
             self.logger.info(f"Cleaned up {cleaned_count} old statistical records")
         
         return {"cleaned_records": cleaned_count}
\ No newline at end of file
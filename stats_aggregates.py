@@ -0,0 +1,126 @@
+
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+METRICS = ("problems_solved", "total_pushes", "Easy", "Medium", "Hard")
+
+
+class UserAggregates:
+    """Incrementally maintained statistics for one user
+    
+    Active days are kept as sorted day ordinals (date.toordinal()) with a
+    prefix-sum array per metric, so totals over any N-day window cost two
+    bisections. Streaks are kept as sorted runs of consecutive active days, and
+    per-language day lists answer "languages used in this window" by bisection.
+    Pushes for the current day append in O(1); out-of-order days cost O(days).
+    """
+    
+    def __init__(self):
+        self.ordinals: List[int] = []
+        self.daily: Dict[str, List[int]] = {metric: [] for metric in METRICS}
+        self.prefix: Dict[str, List[int]] = {metric: [0] for metric in METRICS}
+        self.language_days: Dict[str, List[int]] = {}
+        self.language_counts = Counter()
+        # Runs of consecutive active days as parallel start/end lists
+        self.run_starts: List[int] = []
+        self.run_ends: List[int] = []
+    
+    def add(self, ordinal: int, problems_solved: int = 1, total_pushes: int = 1,
+            difficulties: Dict[str, int] = None, languages: Iterable[str] = ()):
+        """Fold a push (or a whole day's counts) into the aggregates"""
+        deltas = {"problems_solved": problems_solved, "total_pushes": total_pushes}
+        for difficulty in ("Easy", "Medium", "Hard"):
+            deltas[difficulty] = (difficulties or {}).get(difficulty, 0)
+        
+        i = bisect_left(self.ordinals, ordinal)
+        is_new_day = i == len(self.ordinals) or self.ordinals[i] != ordinal
+        was_active = not is_new_day and self.daily["problems_solved"][i] > 0
+        
+        if is_new_day:
+            self.ordinals.insert(i, ordinal)
+            for metric in METRICS:
+                self.daily[metric].insert(i, 0)
+                self.prefix[metric].insert(i + 1, self.prefix[metric][i])
+        
+        for metric, delta in deltas.items():
+            if not delta:
+                continue
+            self.daily[metric][i] += delta
+            prefix = self.prefix[metric]
+            for k in range(i + 1, len(prefix)):
+                prefix[k] += delta
+        
+        for language in languages:
+            self.language_counts[language] += 1
+            days = self.language_days.setdefault(language, [])
+            j = bisect_left(days, ordinal)
+            if j == len(days) or days[j] != ordinal:
+                days.insert(j, ordinal)
+        
+        if not was_active and self.daily["problems_solved"][i] > 0:
+            self._add_active_day(ordinal)
+    
+    def _add_active_day(self, ordinal: int):
+        """Extend or merge streak runs with a newly active day"""
+        i = bisect_right(self.run_starts, ordinal)
+        joins_previous = i > 0 and self.run_ends[i - 1] == ordinal - 1
+        joins_next = i < len(self.run_starts) and self.run_starts[i] == ordinal + 1
+        
+        if joins_previous and joins_next:
+            self.run_ends[i - 1] = self.run_ends[i]
+            del self.run_starts[i]
+            del self.run_ends[i]
+        elif joins_previous:
+            self.run_ends[i - 1] = ordinal
+        elif joins_next:
+            self.run_starts[i] = ordinal
+        else:
+            self.run_starts.insert(i, ordinal)
+            self.run_ends.insert(i, ordinal)
+    
+    def window(self, start: int, end: int) -> Dict:
+        """Aggregate statistics for day ordinals start..end inclusive"""
+        i = bisect_left(self.ordinals, start)
+        j = bisect_right(self.ordinals, end)
+        
+        totals = {metric: self.prefix[metric][j] - self.prefix[metric][i] for metric in METRICS}
+        languages: Set[str] = set()
+        for language, days in self.language_days.items():
+            k = bisect_left(days, start)
+            if k < len(days) and days[k] <= end:
+                languages.add(language)
+        
+        # Runs overlapping the window, clipped to it
+        longest_streak = 0
+        first_run = max(bisect_right(self.run_starts, start) - 1, 0)
+        for r in range(first_run, bisect_right(self.run_starts, end)):
+            clipped = min(self.run_ends[r], end) - max(self.run_starts[r], start) + 1
+            longest_streak = max(longest_streak, clipped)
+        
+        current_streak = 0
+        r = bisect_right(self.run_starts, end) - 1
+        if r >= 0 and self.run_ends[r] >= end:
+            current_streak = end - max(self.run_starts[r], start) + 1
+        
+        return {
+            "total_problems": totals["problems_solved"],
+            "total_pushes": totals["total_pushes"],
+            "difficulties": {"Easy": totals["Easy"], "Medium": totals["Medium"], "Hard": totals["Hard"]},
+            "languages_used": languages,
+            "daily_data": dict(zip(self.ordinals[i:j], self.daily["problems_solved"][i:j])),
+            "streak": current_streak,
+            "longest_streak": longest_streak
+        }
+    
+    @property
+    def totals(self) -> Dict:
+        """All-time running totals"""
+        return {
+            "total_problems": self.prefix["problems_solved"][-1],
+            "total_pushes": self.prefix["total_pushes"][-1],
+            "difficulties": {d: self.prefix[d][-1] for d in ("Easy", "Medium", "Hard")},
+            "languages": dict(self.language_counts),
+            "longest_streak": max((e - s + 1 for s, e in zip(self.run_starts, self.run_ends)), default=0)
+        }
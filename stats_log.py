@@ -0,0 +1,102 @@
+
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator
+
+
+class StatsEventLog:
+    """Append-only JSONL write-ahead log of statistics events
+    
+    Each event is one JSON line. Lines are flushed to the OS on every append and
+    fsynced in batches (every fsync_batch events or fsync_interval seconds,
+    whichever comes first), so a push costs O(1) I/O. A torn final line left by
+    a crash is ignored on replay.
+    """
+    
+    def __init__(self, path: str, fsync_interval: float = 1.0, fsync_batch: int = 100):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def append(self, event: Dict):
+        """Append an event to the log"""
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._lock:
+            f = self._open()
+            f.write(line)
+            f.flush()
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_batch
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._fsync()
+    
+    def replay(self) -> Iterator[Dict]:
+        """Yield every complete event in the log, oldest first"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    
+    def sync(self):
+        """Force buffered events to disk"""
+        with self._lock:
+            if self._file:
+                self._fsync()
+    
+    def truncate(self):
+        """Discard all events, after they have been folded into a snapshot"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self._unsynced = 0
+    
+    def close(self):
+        """Sync and close the log file"""
+        with self._lock:
+            if self._file:
+                self._fsync()
+                self._file.close()
+                self._file = None
+    
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a+", encoding="utf-8")
+            # Terminate a torn line from a crash so the next event starts cleanly
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        return self._file
+    
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
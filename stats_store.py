@@ -0,0 +1,465 @@
+
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from stats_log import StatsEventLog
+from day_stats import DayStats, normalize_difficulty, timestamp_to_int
+
+
+def empty_daily_stats() -> Dict:
+    """Return a fresh per-day statistics record"""
+    return {
+        "problems_solved": 0,
+        "total_pushes": 0,
+        "languages_used": set(),
+        "difficulties": {"Easy": 0, "Medium": 0, "Hard": 0},
+        "solutions": []
+    }
+
+
+class StatsStore:
+    """Storage backend for per-user, per-day solution statistics
+    
+    Dates are 'YYYY-MM-DD' strings. Day records use the daily_stats shape:
+    problems_solved, total_pushes, languages_used (a set), difficulties and solutions.
+    """
+    
+    def record_push(self, user_email: str, date: str, solution: Dict):
+        """Record one pushed solution for a user on a date"""
+        raise NotImplementedError
+    
+    def get_day(self, user_email: str, date: str) -> Optional[Dict]:
+        """Get a user's record for one date, or None if nothing was recorded"""
+        raise NotImplementedError
+    
+    def get_range(self, user_email: str, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """Get a user's records for dates between start_date and end_date inclusive"""
+        raise NotImplementedError
+    
+    def get_range_for_users(self, user_emails: Iterable[str], start_date: str,
+                            end_date: str) -> Dict[str, Dict[str, Dict]]:
+        """Get several users' records for a date range as {user_email: {date: day}}
+        
+        Users with nothing recorded in the range map to an empty dict.
+        """
+        return {user_email: self.get_range(user_email, start_date, end_date) for user_email in user_emails}
+    
+    def delete_before(self, cutoff_date: str) -> int:
+        """Delete every record dated before cutoff_date and return how many (user, date) records went"""
+        raise NotImplementedError
+    
+    def import_stats(self, stats: Dict[str, Dict[str, Dict]]) -> int:
+        """Bulk-load records in the {user_email: {date: day}} shape and return how many were loaded"""
+        raise NotImplementedError
+    
+    def flush(self):
+        """Make recorded data durable"""
+    
+    def close(self):
+        """Release files and connections"""
+
+
+class JsonStatsStore(StatsStore):
+    """In-memory statistics persisted as a JSON snapshot plus an append-only event log
+    
+    Pushes are appended to the log; the snapshot is rewritten only on compaction,
+    every compact_every events. Days are held as compact DayStats records and
+    expanded to dicts only when read.
+    
+    A store-wide lock makes each push (apply and log append) and each compaction
+    (export, snapshot replace and log truncation) atomic with respect to the other,
+    so no push can land between a snapshot and the truncation that follows it.
+    """
+    
+    def __init__(self, snapshot_path: str = "data/daily_stats.json", log_path: str = "data/daily_stats.log.jsonl",
+                 compact_every: int = 1000, fsync_interval: float = 1.0, fsync_batch: int = 100):
+        self.snapshot_path = snapshot_path
+        self.compact_every = compact_every
+        self.log = StatsEventLog(log_path, fsync_interval=fsync_interval, fsync_batch=fsync_batch)
+        self.daily_stats: Dict[str, Dict[str, DayStats]] = {}
+        self.events_since_compaction = 0
+        # Reentrant: record_push, delete_before and import_stats compact while holding it
+        self._lock = threading.RLock()
+    
+    def load(self):
+        """Load the snapshot and replay the event log on top of it
+        
+        An unreadable snapshot is renamed to <snapshot>.corrupt-<time> and ValueError
+        is raised; loading again then starts from the event log alone.
+        """
+        self.daily_stats = {}
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r") as f:
+                    loaded_stats = json.load(f)
+                self.daily_stats = {
+                    user_email: {date: DayStats.from_dict(daily_data) for date, daily_data in user_data.items()}
+                    for user_email, user_data in loaded_stats.items()
+                }
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # Move it aside so the next compaction cannot overwrite what may still be recoverable
+                self.daily_stats = {}
+                corrupt_path = f"{self.snapshot_path}.corrupt-{datetime.now():%Y%m%d%H%M%S}"
+                os.replace(self.snapshot_path, corrupt_path)
+                raise ValueError(f"Unreadable statistics snapshot moved to {corrupt_path}: {e}") from e
+        
+        self.events_since_compaction = 0
+        snapshot_timestamps = {}
+        for event in self.log.replay():
+            if event.get("type") != "push":
+                continue
+            user_email, date, solution = event["user"], event["date"], event["solution"]
+            
+            # A crash between snapshot and log truncation leaves events already in the snapshot
+            key = (user_email, date)
+            if key not in snapshot_timestamps:
+                day = self.daily_stats.get(user_email, {}).get(date)
+                snapshot_timestamps[key] = set(day.timestamps) if day else set()
+            if timestamp_to_int(solution["timestamp"]) in snapshot_timestamps[key]:
+                continue
+            
+            self._apply_push(user_email, date, solution)
+            self.events_since_compaction += 1
+    
+    def compact(self):
+        """Write a snapshot of all statistics and truncate the event log"""
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._lock:
+            stats_to_save = self.export_stats()
+            
+            # Replace the snapshot atomically before dropping the events it now contains
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(stats_to_save, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            
+            self.log.truncate()
+            self.events_since_compaction = 0
+    
+    def export_stats(self) -> Dict[str, Dict[str, Dict]]:
+        """Expand every record into the JSON-serializable {user_email: {date: day}} shape"""
+        stats = {}
+        with self._lock:
+            for user_email, user_data in self.daily_stats.items():
+                stats[user_email] = {}
+                for date, day in user_data.items():
+                    daily_data = day.to_dict()
+                    # Convert sets to lists for JSON serialization
+                    daily_data["languages_used"] = list(daily_data["languages_used"])
+                    stats[user_email][date] = daily_data
+        return stats
+    
+    def record_push(self, user_email: str, date: str, solution: Dict):
+        with self._lock:
+            self._apply_push(user_email, date, solution)
+            self.log.append({"type": "push", "user": user_email, "date": date, "solution": solution})
+            self.events_since_compaction += 1
+            if self.events_since_compaction >= self.compact_every:
+                self.compact()
+    
+    def _apply_push(self, user_email: str, date: str, solution: Dict):
+        """Fold a solution push into the in-memory daily statistics"""
+        day = self.daily_stats.setdefault(user_email, {}).get(date)
+        if day is None:
+            day = self.daily_stats[user_email][date] = DayStats()
+        day.add_solution(solution)
+    
+    def get_day(self, user_email: str, date: str) -> Optional[Dict]:
+        with self._lock:
+            day = self.daily_stats.get(user_email, {}).get(date)
+            return day.to_dict() if day is not None else None
+    
+    def get_range(self, user_email: str, start_date: str, end_date: str) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                date: day.to_dict()
+                for date, day in self.daily_stats.get(user_email, {}).items()
+                if start_date <= date <= end_date
+            }
+    
+    def delete_before(self, cutoff_date: str) -> int:
+        cleaned_count = 0
+        with self._lock:
+            for user_email in list(self.daily_stats.keys()):
+                for date in list(self.daily_stats[user_email].keys()):
+                    if date < cutoff_date:
+                        del self.daily_stats[user_email][date]
+                        cleaned_count += 1
+            
+            if cleaned_count > 0:
+                self.compact()
+        return cleaned_count
+    
+    def import_stats(self, stats: Dict[str, Dict[str, Dict]]) -> int:
+        count = 0
+        with self._lock:
+            for user_email, user_data in stats.items():
+                for date, daily_data in user_data.items():
+                    self.daily_stats.setdefault(user_email, {})[date] = DayStats.from_dict(daily_data)
+                    count += 1
+            self.compact()
+        return count
+    
+    def flush(self):
+        self.log.sync()
+    
+    def close(self):
+        self.log.close()
+
+
+class SQLiteStatsStore(StatsStore):
+    """SQLite statistics backend with indexed per-user date-range queries
+    
+    Uses WAL mode so dashboard reads never block pushes. Per-day counters live in
+    daily_stats, keyed by (user_email, date); individual pushes live in solutions
+    with an index on (user_email, date).
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            user_email TEXT NOT NULL,
+            date TEXT NOT NULL,
+            problems_solved INTEGER NOT NULL DEFAULT 0,
+            total_pushes INTEGER NOT NULL DEFAULT 0,
+            easy INTEGER NOT NULL DEFAULT 0,
+            medium INTEGER NOT NULL DEFAULT 0,
+            hard INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_email, date)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_daily_stats_date ON daily_stats (date);
+        CREATE TABLE IF NOT EXISTS solutions (
+            id INTEGER PRIMARY KEY,
+            user_email TEXT NOT NULL,
+            date TEXT NOT NULL,
+            title TEXT,
+            difficulty TEXT,
+            language TEXT,
+            timestamp TEXT,
+            url TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_solutions_user_date ON solutions (user_email, date);
+        CREATE INDEX IF NOT EXISTS idx_solutions_date ON solutions (date);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, db_path: str = "leetcode_agent.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(self.SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def record_push(self, user_email: str, date: str, solution: Dict):
+        difficulty = normalize_difficulty(solution["difficulty"])
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO daily_stats (user_email, date, problems_solved, total_pushes, easy, medium, hard)
+                VALUES (?, ?, 1, 1, ?, ?, ?)
+                ON CONFLICT (user_email, date) DO UPDATE SET
+                    problems_solved = problems_solved + 1,
+                    total_pushes = total_pushes + 1,
+                    easy = easy + excluded.easy,
+                    medium = medium + excluded.medium,
+                    hard = hard + excluded.hard
+                """,
+                (user_email, date, int(difficulty == "Easy"), int(difficulty == "Medium"), int(difficulty == "Hard"))
+            )
+            conn.execute(
+                "INSERT INTO solutions (user_email, date, title, difficulty, language, timestamp, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_email, date, solution["title"], difficulty, solution["language"],
+                 solution["timestamp"], solution["url"])
+            )
+    
+    def get_day(self, user_email: str, date: str) -> Optional[Dict]:
+        return self.get_range(user_email, date, date).get(date)
+    
+    def get_range(self, user_email: str, start_date: str, end_date: str) -> Dict[str, Dict]:
+        return self._load_days("user_email = ? AND date BETWEEN ? AND ?",
+                               (user_email, start_date, end_date)).get(user_email, {})
+    
+    def get_range_for_users(self, user_emails: Iterable[str], start_date: str,
+                            end_date: str) -> Dict[str, Dict[str, Dict]]:
+        # One scan of the date index for everyone instead of a query pair per user
+        users = {user_email: {} for user_email in user_emails}
+        days = self._load_days("date BETWEEN ? AND ?", (start_date, end_date), users.keys())
+        for user_email in users:
+            users[user_email] = days.get(user_email, {})
+        return users
+    
+    def _load_days(self, where: str, params: tuple, user_emails=None) -> Dict[str, Dict[str, Dict]]:
+        """Build {user_email: {date: day}} from the rows matching a WHERE clause
+        
+        user_emails, when given, filters the rows to those users.
+        """
+        conn = self._connect()
+        days = {}
+        for user_email, date, problems_solved, total_pushes, easy, medium, hard in conn.execute(
+            "SELECT user_email, date, problems_solved, total_pushes, easy, medium, hard FROM daily_stats "
+            f"WHERE {where} ORDER BY date",
+            params
+        ):
+            if user_emails is not None and user_email not in user_emails:
+                continue
+            daily_data = empty_daily_stats()
+            daily_data["problems_solved"] = problems_solved
+            daily_data["total_pushes"] = total_pushes
+            daily_data["difficulties"] = {"Easy": easy, "Medium": medium, "Hard": hard}
+            days.setdefault(user_email, {})[date] = daily_data
+        
+        if days:
+            for user_email, date, title, difficulty, language, timestamp, url in conn.execute(
+                "SELECT user_email, date, title, difficulty, language, timestamp, url FROM solutions "
+                f"WHERE {where} ORDER BY id",
+                params
+            ):
+                daily_data = days.get(user_email, {}).get(date)
+                if daily_data is None:
+                    continue
+                daily_data["languages_used"].add(language)
+                daily_data["solutions"].append({
+                    "title": title,
+                    "difficulty": difficulty,
+                    "language": language,
+                    "timestamp": timestamp,
+                    "url": url
+                })
+        return days
+    
+    def delete_before(self, cutoff_date: str) -> int:
+        conn = self._connect()
+        with conn:
+            cleaned_count = conn.execute("DELETE FROM daily_stats WHERE date < ?", (cutoff_date,)).rowcount
+            conn.execute("DELETE FROM solutions WHERE date < ?", (cutoff_date,))
+        return cleaned_count
+    
+    def import_stats(self, stats: Dict[str, Dict[str, Dict]]) -> int:
+        return self._import_stats(stats)
+    
+    def _import_stats(self, stats: Dict[str, Dict[str, Dict]], meta: Dict[str, str] = None) -> int:
+        """Bulk-load records and write meta entries in a single transaction"""
+        daily_rows = []
+        solution_rows = []
+        for user_email, user_data in stats.items():
+            for date, daily_data in user_data.items():
+                difficulties = daily_data.get("difficulties", {})
+                daily_rows.append((
+                    user_email, date,
+                    daily_data.get("problems_solved", 0), daily_data.get("total_pushes", 0),
+                    difficulties.get("Easy", 0), difficulties.get("Medium", 0), difficulties.get("Hard", 0)
+                ))
+                for solution in daily_data.get("solutions", []):
+                    solution_rows.append((
+                        user_email, date, solution.get("title"), solution.get("difficulty"),
+                        solution.get("language"), solution.get("timestamp"), solution.get("url")
+                    ))
+        
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO daily_stats (user_email, date, problems_solved, total_pushes, easy, medium, hard) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                daily_rows
+            )
+            conn.executemany(
+                "INSERT INTO solutions (user_email, date, title, difficulty, language, timestamp, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                solution_rows
+            )
+            if meta:
+                conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+        return len(daily_rows)
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the meta table"""
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str):
+        """Write a value to the meta table"""
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def migrate_from_json(self, snapshot_path: str = "data/daily_stats.json",
+                          log_path: str = "data/daily_stats.log.jsonl") -> int:
+        """Import statistics from the JSON snapshot and event log, once
+        
+        Returns the number of day records imported (0 if already migrated or nothing to import).
+        """
+        if self.get_meta("migrated_from_json"):
+            return 0
+        if not os.path.exists(snapshot_path) and not os.path.exists(log_path):
+            return 0
+        
+        json_store = JsonStatsStore(snapshot_path, log_path)
+        json_store.load()
+        # The marker commits with the rows, so a crash cannot lead to a second, duplicating import
+        return self._import_stats(json_store.export_stats(), meta={"migrated_from_json": snapshot_path})
+    
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_stats_store(database_url: Optional[str], compact_every: int = 1000,
+                       fsync_interval: float = 1.0, fsync_batch: int = 100) -> StatsStore:
+    """Build the statistics backend for a DATABASE_URL
+    
+    'sqlite:///path/to.db' selects SQLiteStatsStore; anything else (including unset)
+    keeps the JSON snapshot and event log under data/.
+    """
+    if database_url and database_url.startswith("sqlite:///"):
+        return SQLiteStatsStore(database_url[len("sqlite:///"):])
+    
+    store = JsonStatsStore(compact_every=compact_every, fsync_interval=fsync_interval, fsync_batch=fsync_batch)
+    store.load()
+    return store
+
+
+def main():
+    """Command-line entry point for migrating JSON statistics into SQLite"""
+    parser = argparse.ArgumentParser(description="Migrate data/daily_stats.json into SQLite")
+    parser.add_argument("database_url", help="target database, e.g. sqlite:///leetcode_agent.db")
+    parser.add_argument("--snapshot", default="data/daily_stats.json")
+    parser.add_argument("--log", default="data/daily_stats.log.jsonl")
+    args = parser.parse_args()
+    
+    if not args.database_url.startswith("sqlite:///"):
+        parser.error("only sqlite:/// URLs are supported")
+    
+    store = SQLiteStatsStore(args.database_url[len("sqlite:///"):])
+    print(f"Imported {store.migrate_from_json(args.snapshot, args.log)} day records")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
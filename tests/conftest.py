@@ -0,0 +1,7 @@
+
+
+import os
+import sys
+
+# The backend modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+
+
+import json
+
+import pytest
+
+import aiml_client
+from aiml_cache import ResponseCache
+from circuit_breaker import CLOSED, CircuitBreaker
+
+
+class FakeStreamResponse:
+    """A streamed chat completion that sends a few text chunks"""
+    
+    status_code = 200
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_lines(self, chunk_size=None):
+        for text in self.chunks:
+            yield ("data: " + json.dumps({"choices": [{"delta": {"content": text}}]})).encode("utf-8")
+        yield b"data: [DONE]"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(aiml_client.requests, "post",
+                        lambda *args, **kwargs: FakeStreamResponse(["one ", "two ", "three"]))
+    client = aiml_client.AIMLClient(cache=ResponseCache(None))
+    client.circuit_breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=30)
+    return client
+
+
+def test_closing_streams_early_keeps_the_breaker_closed(client):
+    for i in range(5):
+        stream = client.stream_explain_algorithm(f"algorithm {i}")
+        assert next(stream) == "one "
+        assert next(stream) == "two "
+        stream.close()
+    
+    stats = client.circuit_breaker.stats()
+    assert stats["state"] == CLOSED
+    assert stats["failures"] == 0
+
+
+def test_closed_probe_stream_closes_a_half_open_breaker(client):
+    client.circuit_breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    client.circuit_breaker.record_failure()
+    
+    stream = client.stream_explain_algorithm("depth-first search")
+    assert next(stream) == "one "
+    stream.close()
+    
+    assert client.circuit_breaker.state == CLOSED
+
+
+def test_finished_stream_returns_the_full_result(client):
+    stream = client.stream_explain_algorithm("binary search")
+    chunks = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            chunks.append(next(stream))
+    
+    assert chunks == ["one ", "two ", "three"]
+    assert stop.value.value["success"]
+    assert client.circuit_breaker.stats()["failures"] == 0
@@ -0,0 +1,29 @@
+
+
+from aiml_prompts import clean_problem_text, fit_inputs
+
+
+def test_plain_text_constraints_are_kept():
+    text = "Find the pair.\n\nConstraints:\n1 <= n <= 10^5\n0 <= i < j < n\nnums[i] > 0"
+    assert clean_problem_text(text) == text
+
+
+def test_comparisons_on_one_line_are_not_tags():
+    assert clean_problem_text("a < b > c") == "a < b > c"
+    assert clean_problem_text("Return x if x < y, else y if y > 0.") == "Return x if x < y, else y if y > 0."
+    assert clean_problem_text("Count pairs with i<j and j>k.") == "Count pairs with i<j and j>k."
+
+
+def test_html_statement_is_stripped():
+    html = (
+        '<p>Given an array <code>nums</code>.</p><div class="example">Output: 2</div>'
+        "<ul><li><code>1 &lt;= nums.length &lt;= 10<sup>5</sup></code></li></ul>"
+        "<script>track()</script>"
+    )
+    assert clean_problem_text(html) == "Given an array nums.\nOutput: 2\n1 <= nums.length <= 10^5"
+
+
+def test_fit_inputs_keeps_constraints_of_plain_text():
+    fitted, report = fit_inputs({"problem_text": "Constraints:\n1 <= n <= 10^5"}, 1000)
+    assert fitted["problem_text"] == "Constraints:\n1 <= n <= 10^5"
+    assert report["truncated"] == []
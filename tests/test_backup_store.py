@@ -0,0 +1,38 @@
+
+
+import os
+
+from backup_store import BackupStore
+
+
+def backup(store, user, count):
+    for i in range(count):
+        store.create_backup(user, [{"name": f"{user}-repo", "updated_at": str(i), "pushed_at": str(i)}])
+
+
+def test_user_prune_leaves_other_users_and_chunks(tmp_path):
+    store = BackupStore(str(tmp_path), grace_period=0)
+    backup(store, "bob", 3)
+    backup(store, "bob_dev", 3)
+    chunks_before = sum(len(files) for _, _, files in os.walk(store.chunks_dir))
+    
+    result = store.prune(keep_last=1, user="bob")
+    
+    assert result == {"manifests_removed": 2, "chunks_removed": 0}
+    assert len(store.list_manifests("bob")) == 1
+    assert len(store.list_manifests("bob_dev")) == 3
+    assert sum(len(files) for _, _, files in os.walk(store.chunks_dir)) == chunks_before
+
+
+def test_full_prune_skips_manifests_removed_by_a_concurrent_prune(tmp_path, monkeypatch):
+    store = BackupStore(str(tmp_path), grace_period=0)
+    backup(store, "bob", 3)
+    names = store.list_manifests()
+    # Another prune deletes the oldest manifest after this one has listed it
+    os.remove(os.path.join(store.manifests_dir, names[0]))
+    monkeypatch.setattr(store, "list_manifests", lambda user=None: names)
+    
+    result = store.prune(keep_last=1)
+    
+    assert result == {"manifests_removed": 1, "chunks_removed": 2}
+    assert store.restore(user="bob")["repositories"] == [{"name": "bob-repo", "updated_at": "2", "pushed_at": "2"}]
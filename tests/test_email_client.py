@@ -0,0 +1,178 @@
+
+
+import socket
+import time
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from email_client import EmailClient
+
+
+class RecordingHandler:
+    """SMTP stand-in: accepts mail, rejects some recipients and remembers every session"""
+    
+    def __init__(self):
+        self.sessions = []
+        self.transports = []
+        self.delivered = []
+        self.fail_next_data = 0
+    
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("unknown@"):
+            return "550 5.1.1 No such user"
+        if address.startswith("busy@"):
+            return "451 4.2.0 Mailbox busy, try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+    
+    async def handle_DATA(self, server, session, envelope):
+        if session not in self.sessions:
+            self.sessions.append(session)
+            self.transports.append(server.transport)
+        if self.fail_next_data:
+            self.fail_next_data -= 1
+            return "421 4.3.2 Service shutting down"
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+    
+    def drop_connections(self, loop):
+        """Close every client connection from the server side, on the server's event loop"""
+        for transport in self.transports:
+            loop.call_soon_threadsafe(transport.close)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _client(controller, **kwargs) -> EmailClient:
+    options = {"pool_size": 2, "idle_timeout": 60, "timeout": 5}
+    options.update(kwargs)
+    return EmailClient(host=controller.hostname, port=controller.port, user="", password="",
+                       use_tls=False, from_address="agent@example.com", **options)
+
+
+def _messages(count: int, domain: str = "example.com"):
+    return [{"to": f"user{i}@{domain}", "subject": f"Message {i}", "text": "hello"} for i in range(count)]
+
+
+def _wait_for(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_send_batch_reuses_pooled_connections(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=2)
+    
+    first = client.send_batch(_messages(10))
+    second = client.send_batch(_messages(10))
+    
+    assert all(result["success"] for result in first + second)
+    assert len(handler.delivered) == 20
+    # Twenty messages over two batches, but never more connections than the pool holds
+    assert len(handler.sessions) == 2
+
+
+def test_results_keep_message_order(smtp_server):
+    controller, _ = smtp_server
+    client = _client(controller, pool_size=3)
+    
+    messages = _messages(7)
+    results = client.send_batch(messages)
+    
+    assert [result["to"] for result in results] == [message["to"] for message in messages]
+
+
+def test_reconnects_once_after_421(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=1)
+    handler.fail_next_data = 1
+    
+    result = client.send_email("user@example.com", "Retried", text="hello")
+    
+    assert result["success"]
+    assert handler.delivered == ["user@example.com"]
+    assert len(handler.sessions) == 2
+
+
+def test_reconnects_once_after_server_disconnect(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=1)
+    assert client.send_email("first@example.com", "First", text="hello")["success"]
+    
+    handler.drop_connections(controller.loop)
+    _wait_for(lambda: all(transport.is_closing() for transport in handler.transports))
+    result = client.send_email("second@example.com", "Second", text="hello")
+    
+    assert result["success"]
+    assert handler.delivered == ["first@example.com", "second@example.com"]
+    assert len(handler.sessions) == 2
+
+
+def test_gives_up_after_one_reconnect(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=1)
+    handler.fail_next_data = 2
+    
+    result = client.send_email("user@example.com", "Dropped twice", text="hello")
+    
+    assert not result["success"]
+    assert not result.get("permanent")
+    assert handler.delivered == []
+
+
+def test_idle_connections_are_replaced(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=1, idle_timeout=0.1)
+    
+    assert client.send_email("first@example.com", "First", text="hello")["success"]
+    assert client.send_email("second@example.com", "Second", text="hello")["success"]
+    assert len(handler.sessions) == 1
+    
+    time.sleep(0.2)
+    assert client.send_email("third@example.com", "Third", text="hello")["success"]
+    assert len(handler.sessions) == 2
+
+
+def test_per_recipient_permanent_and_temporary_results(smtp_server):
+    controller, handler = smtp_server
+    client = _client(controller, pool_size=1)
+    
+    results = client.send_batch([
+        {"to": "user@example.com", "subject": "Delivered", "text": "hello"},
+        {"to": "unknown@example.com", "subject": "Bounced", "text": "hello"},
+        {"to": "busy@example.com", "subject": "Deferred", "text": "hello"},
+        {"to": "other@example.com", "subject": "Delivered too", "text": "hello"}
+    ])
+    
+    assert [result["success"] for result in results] == [True, False, False, True]
+    assert results[1]["permanent"] is True
+    assert results[2]["permanent"] is False
+    # A refused recipient does not cost the session
+    assert handler.delivered == ["user@example.com", "other@example.com"]
+    assert len(handler.sessions) == 1
+
+
+def test_connection_failure_is_not_permanent():
+    client = EmailClient(host="127.0.0.1", port=_free_port(), user="", password="", use_tls=False,
+                         from_address="agent@example.com", pool_size=1, timeout=2)
+    
+    result = client.send_email("user@example.com", "Unreachable", text="hello")
+    
+    assert not result["success"]
+    assert not result.get("permanent")
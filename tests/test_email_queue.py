@@ -0,0 +1,59 @@
+
+
+import sqlite3
+
+import pytest
+
+from email_queue import EmailQueue
+
+
+class StealingEmailClient:
+    """Sends one message per round and lets another worker reclaim rows mid-send"""
+    
+    pool_size = 1
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.sent = []
+        self.steal = []
+    
+    def send_batch(self, messages):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            for subject in self.steal:
+                conn.execute("UPDATE outbox SET leased_until = leased_until + 1 WHERE subject = ?", (subject,))
+        conn.close()
+        self.steal = []
+        self.sent.extend(message["subject"] for message in messages)
+        return [{"success": True} for _ in messages]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    db_path = str(tmp_path / "queue.db")
+    return EmailQueue(db_path, StealingEmailClient(db_path), workers=1)
+
+
+def status_of(queue, subject):
+    return queue._connect().execute("SELECT status FROM outbox WHERE subject = ?", (subject,)).fetchone()[0]
+
+
+def test_messages_reclaimed_by_another_worker_are_not_sent(queue):
+    queue.enqueue_batch([{"to": "a@example.com", "subject": s, "text": "hi"} for s in ("first", "second")])
+    queue.email_client.steal = ["second"]
+    
+    queue._deliver(queue._claim_batch())
+    
+    assert queue.email_client.sent == ["first"]
+    assert status_of(queue, "first") == "sent"
+    assert status_of(queue, "second") == "pending"
+
+
+def test_sent_message_is_not_marked_once_its_lease_is_lost(queue):
+    queue.enqueue("a@example.com", "only", text="hi")
+    queue.email_client.steal = ["only"]
+    
+    queue._deliver(queue._claim_batch())
+    
+    assert queue.email_client.sent == ["only"]
+    assert status_of(queue, "only") == "pending"
@@ -0,0 +1,142 @@
+
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import scheduler as scheduler_module
+from config import Config
+from scheduler import LeetCodeScheduler
+from stats_aggregates import UserAggregates
+from stats_store import SQLiteStatsStore
+from timer_engine import WEEKDAYS, DailyTrigger
+
+
+class RecordingStatsStore:
+    """Answers range queries with no data and remembers which days were asked for"""
+    
+    def __init__(self):
+        self.ranges = []
+    
+    def get_range_for_users(self, user_emails, start_date, end_date):
+        self.ranges.append((start_date, end_date))
+        return {user_email: {} for user_email in user_emails}
+
+
+class FakeTimer:
+    """Keeps registered jobs and submitted one-off tasks without running anything"""
+    
+    running = False
+    
+    def __init__(self):
+        self.submitted = []
+    
+    def add(self, name, trigger, func):
+        return SimpleNamespace(name=name, trigger=trigger, func=func)
+    
+    def submit(self, name, func):
+        self.submitted.append(func)
+    
+    def start(self):
+        pass
+
+
+class FakeJobStore:
+    def __init__(self, rows):
+        self.rows = rows
+        self.runs = []
+    
+    def load_all(self):
+        return self.rows
+    
+    def mark_run(self, jobs, when):
+        self.runs.append((jobs, when))
+
+
+@pytest.fixture
+def scheduler():
+    # Skip __init__: these tests only need the report builders, not the timer, queue or data files
+    scheduler = LeetCodeScheduler.__new__(LeetCodeScheduler)
+    scheduler.stats_store = RecordingStatsStore()
+    return scheduler
+
+
+def test_daily_summary_is_dated_in_the_bucket_timezone(scheduler):
+    # An 18:00 summary in Los Angeles fires at 01:00 UTC on the next day
+    fire_time = datetime(2024, 3, 6, 1, 0, tzinfo=timezone.utc)
+    
+    scheduler.generate_notifications("daily_summary", ["a@example.com"], fire_time, "America/Los_Angeles")
+    
+    assert scheduler.stats_store.ranges == [("2024-03-05", "2024-03-05")]
+
+
+def test_weekly_report_ends_on_the_local_fire_day(scheduler):
+    fire_time = datetime(2024, 3, 6, 1, 0, tzinfo=timezone.utc)
+    
+    payloads = scheduler.generate_notifications("weekly_report", ["a@example.com"], fire_time, "America/Los_Angeles")
+    
+    assert scheduler.stats_store.ranges == [("2024-02-28", "2024-03-05")]
+    assert payloads["a@example.com"]["end_date"] == "2024-03-05"
+
+
+def test_catchup_serves_the_missed_fire_time(scheduler, monkeypatch):
+    monkeypatch.setattr(Config, "SCHEDULER_CATCHUP_HOURS", 48)
+    trigger = DailyTrigger("18:00", None, "America/Los_Angeles")
+    loaded_at = scheduler_module.utc_now()
+    missed = trigger.previous_before(loaded_at)
+    scheduler.timer = FakeTimer()
+    scheduler.email_queue = SimpleNamespace(start=lambda: None)
+    scheduler.job_store = FakeJobStore([{
+        "user_email": "a@example.com",
+        "job_kind": "daily_summary",
+        "send_time": "18:00",
+        "weekdays": tuple(WEEKDAYS),
+        "timezone": "America/Los_Angeles",
+        "last_run": None
+    }])
+    scheduler.jobs, scheduler.buckets, scheduler.pending_catchup = {}, {}, {}
+    scheduler.jobs_lock = threading.Lock()
+    scheduler.logger = logging.getLogger(__name__)
+    served = []
+    monkeypatch.setattr(scheduler, "generate_notifications",
+                        lambda job_kind, user_emails, fire_time, timezone_name: served.append(fire_time) or {})
+    monkeypatch.setattr(scheduler, "_queue_notifications", lambda job_kind, payloads, fire_time: {})
+    
+    scheduler.load_jobs()
+    scheduler.start()
+    # The catch-up task runs after another scheduled day has gone by
+    monkeypatch.setattr(scheduler_module, "utc_now", lambda: loaded_at + timedelta(days=1))
+    for task in scheduler.timer.submitted:
+        task()
+    
+    assert served == [missed]
+
+
+def test_lower_case_difficulty_is_counted_by_store_and_aggregates(scheduler, tmp_path):
+    scheduler.stats_store = SQLiteStatsStore(str(tmp_path / "stats.db"))
+    scheduler.aggregates_lock = threading.Lock()
+    scheduler.user_aggregates = {"a@example.com": UserAggregates()}
+    scheduler.logger = logging.getLogger(__name__)
+    
+    scheduler.record_solution_push("a@example.com", {"title": "Two Sum", "difficulty": "easy", "language": "python"})
+    
+    day = scheduler.stats_store.get_day("a@example.com", datetime.now().strftime('%Y-%m-%d'))
+    assert day["difficulties"] == {"Easy": 1, "Medium": 0, "Hard": 0}
+    assert day["solutions"][0]["difficulty"] == "Easy"
+    assert scheduler.user_aggregates["a@example.com"].totals["difficulties"]["Easy"] == 1
+
+
+def test_failed_sqlite_migration_stops_start_up(scheduler, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATABASE_URL", f"sqlite:///{tmp_path / 'stats.db'}")
+    
+    def fail(self, snapshot_path, log_path):
+        raise ValueError("corrupt snapshot")
+    
+    monkeypatch.setattr(SQLiteStatsStore, "migrate_from_json", fail)
+    scheduler.logger = logging.getLogger(__name__)
+    
+    with pytest.raises(ValueError):
+        scheduler.load_statistics()
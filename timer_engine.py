@@ -0,0 +1,238 @@
+
+
+import itertools
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Upper bound on a single sleep, so wall-clock jumps (NTP, suspend) are noticed
+MAX_SLEEP = 300
+
+
+def parse_time(at: str):
+    """Parse "HH:MM" (or "HH:MM:SS") into (hour, minute, second)"""
+    parts = [int(part) for part in at.split(":")]
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Invalid time format: {at!r}, expected HH:MM")
+    hour, minute, second = parts[0], parts[1], parts[2] if len(parts) == 3 else 0
+    if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+        raise ValueError(f"Invalid time: {at!r}")
+    return hour, minute, second
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """Look up an IANA timezone, raising ValueError for unknown names"""
+    try:
+        return ZoneInfo(name)
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"Unknown timezone: {name!r}") from e
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DailyTrigger:
+    """Fires at a wall-clock time on the given weekdays (every day by default)
+    
+    The time is read in the given IANA timezone, or the server's local time when
+    none is set. Fire times are returned as aware UTC datetimes. Across DST changes
+    the wall-clock time is kept: a time skipped by spring-forward fires at the
+    same offset from midnight in the new offset (02:30 becomes 03:30), and a time
+    repeated by fall-back fires once, on its first occurrence.
+    """
+    
+    def __init__(self, at: str, weekdays: Iterable[str] = None, timezone_name: str = None):
+        self.at = at
+        self.hour, self.minute, self.second = parse_time(at)
+        if weekdays is None:
+            self.weekdays = frozenset(range(7))
+        else:
+            self.weekdays = frozenset(WEEKDAYS.index(day.lower()) for day in weekdays)
+        if not self.weekdays:
+            raise ValueError("At least one weekday is required")
+        self.timezone = timezone_name
+        self.zone = get_zone(timezone_name) if timezone_name else None
+    
+    def _to_local(self, moment: datetime) -> datetime:
+        # Naive local datetimes are converted to UTC by astimezone using the system rules
+        return moment.astimezone(self.zone) if self.zone else moment.astimezone().replace(tzinfo=None)
+    
+    def _at(self, local: datetime) -> datetime:
+        return local.replace(hour=self.hour, minute=self.minute, second=self.second, microsecond=0, fold=0)
+    
+    def next_after(self, moment: datetime) -> datetime:
+        """First fire time strictly after the aware datetime moment, in UTC"""
+        local = self._to_local(moment)
+        candidate = self._at(local)
+        while candidate.weekday() not in self.weekdays or candidate.astimezone(timezone.utc) <= moment:
+            # Wall-clock arithmetic: the next calendar day at the same local time
+            candidate = self._at(candidate + timedelta(days=1))
+        return candidate.astimezone(timezone.utc)
+    
+    def previous_before(self, moment: datetime) -> datetime:
+        """Latest fire time at or before the aware datetime moment, in UTC"""
+        local = self._to_local(moment)
+        candidate = self._at(local)
+        while candidate.weekday() not in self.weekdays or candidate.astimezone(timezone.utc) > moment:
+            candidate = self._at(candidate - timedelta(days=1))
+        return candidate.astimezone(timezone.utc)
+    
+    @property
+    def weekday_names(self) -> List[str]:
+        return [WEEKDAYS[d] for d in sorted(self.weekdays)]
+    
+    def __repr__(self):
+        return f"DailyTrigger({self.at!r}, {','.join(self.weekday_names)}, {self.timezone or 'local'})"
+
+
+class TimerJob:
+    """A recurring job registered with a TimerEngine"""
+    
+    def __init__(self, name: str, trigger: DailyTrigger, func: Callable[[], None]):
+        self.name = name
+        self.trigger = trigger
+        self.func = func
+        self.next_run: Optional[datetime] = None
+        self.sequence = 0
+        self.cancelled = False
+    
+    def __repr__(self):
+        return f"TimerJob({self.name!r}, {self.trigger!r}, next_run={self.next_run})"
+
+
+class TimerEngine:
+    """Timer that sleeps until the next due job
+    
+    Jobs sit in an index sorted by their next UTC fire instant, so the jobs due now
+    are the slice up to bisect(now) and cancelling one is a bisection. The timer
+    thread waits on a condition variable for exactly the time left until the first
+    entry (capped at MAX_SLEEP), and is woken early whenever a job is added or
+    cancelled. Due jobs are handed to a bounded thread pool, so a slow job never
+    delays the others.
+    """
+    
+    def __init__(self, max_workers: int = 4, logger: logging.Logger = None):
+        self.max_workers = max_workers
+        self.logger = logger or logging.getLogger(__name__)
+        # Sorted (next_run, sequence, job) entries
+        self._index = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._running
+    
+    def add(self, name: str, trigger: DailyTrigger, func: Callable[[], None]) -> TimerJob:
+        """Register a recurring job and wake the timer if it is now the earliest"""
+        job = TimerJob(name, trigger, func)
+        with self._condition:
+            self._insert(job, trigger.next_after(utc_now()))
+            self._condition.notify()
+        return job
+    
+    def cancel(self, job: TimerJob):
+        """Stop a job from firing again"""
+        with self._condition:
+            if job.cancelled:
+                return
+            job.cancelled = True
+            self._remove(job)
+            self._condition.notify()
+    
+    def submit(self, name: str, func: Callable[[], None]):
+        """Run a one-off job on the worker pool now; the engine must be running"""
+        self._executor.submit(self._execute, TimerJob(name, None, func))
+    
+    def jobs(self) -> List[TimerJob]:
+        """Active jobs, soonest first"""
+        with self._condition:
+            return [job for _, _, job in self._index]
+    
+    def due(self, moment: datetime = None) -> List[TimerJob]:
+        """Jobs whose next run is at or before moment (default now)"""
+        with self._condition:
+            return [job for _, _, job in self._index[:self._due_count(moment or utc_now())]]
+    
+    def start(self):
+        """Start the timer thread and worker pool"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="timer-worker")
+            self._thread = threading.Thread(target=self._run, name="timer", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5):
+        """Stop the timer thread; running jobs finish, queued ones are dropped"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._thread = None
+        self._executor = None
+    
+    def _insert(self, job: TimerJob, when: datetime):
+        job.next_run = when
+        job.sequence = next(self._counter)
+        insort(self._index, (when, job.sequence, job))
+    
+    def _remove(self, job: TimerJob):
+        i = bisect_left(self._index, (job.next_run, job.sequence))
+        if i < len(self._index) and self._index[i][2] is job:
+            del self._index[i]
+    
+    def _due_count(self, moment: datetime) -> int:
+        # Sequences are ints, so (moment, inf) sorts after every entry at moment
+        return bisect_right(self._index, (moment, float("inf")))
+    
+    def _run(self):
+        """Timer loop: take due jobs, reschedule them, and dispatch them to the pool"""
+        with self._condition:
+            while self._running:
+                if not self._index:
+                    self._condition.wait()
+                    continue
+                
+                now = utc_now()
+                due_count = self._due_count(now)
+                if not due_count:
+                    delay = (self._index[0][0] - now).total_seconds()
+                    self._condition.wait(min(delay, MAX_SLEEP))
+                    continue
+                
+                due = self._index[:due_count]
+                del self._index[:due_count]
+                for when, _, job in due:
+                    # Missed runs (e.g. after a suspend) are skipped, not replayed
+                    self._insert(job, job.trigger.next_after(max(when, now)))
+                    try:
+                        self._executor.submit(self._execute, job)
+                    except RuntimeError:
+                        return
+    
+    def _execute(self, job: TimerJob):
+        started = time.monotonic()
+        try:
+            job.func()
+        except Exception as e:
+            self.logger.error(f"Scheduled job {job.name} failed: {str(e)}")
+        else:
+            self.logger.debug(f"Scheduled job {job.name} finished in {time.monotonic() - started:.2f}s")